@@ -13,7 +13,7 @@ load_dotenv()
 # Add shared directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'shared'))
 
-from supabase_storage import _get_supabase_client, get_daily_totals_by_date
+from supabase_storage import _get_supabase_client, get_daily_totals_by_date, get_daily_totals_for_dates
 
 app = Flask(__name__)
 
@@ -48,15 +48,16 @@ def get_calorie_history_by_period(period: str, start_date: str = None, end_date:
         start_dt = datetime.fromisoformat(start_date)
         end_dt = datetime.fromisoformat(end_date)
         
-        chart_data = []
+        dates = []
         current_date = start_dt
         
         while current_date <= end_dt:
-            date_str = current_date.date().isoformat()
-            
-            # Get daily totals for this date (reusing existing function)
-            daily_totals = get_daily_totals_by_date(date_str)
-            
+            dates.append(current_date.date().isoformat())
+            current_date += timedelta(days=1)
+        
+        # Days are independent, so their totals are fetched concurrently
+        chart_data = []
+        for date_str, daily_totals in zip(dates, get_daily_totals_for_dates(dates)):
             chart_data.append({
                 "date": date_str,
                 "calories": daily_totals["calories"],
@@ -65,8 +66,6 @@ def get_calorie_history_by_period(period: str, start_date: str = None, end_date:
                 "carbs_g": daily_totals["carbs_g"],
                 "fat_g": daily_totals["fat_g"]
             })
-            
-            current_date += timedelta(days=1)
         
         return chart_data
         
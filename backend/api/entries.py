@@ -7,18 +7,19 @@ from http.server import BaseHTTPRequestHandler
 # Add shared directory to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'shared'))
 
-from supabase_storage import get_today_entries
+from supabase_storage import get_today_summary
 
 class handler(BaseHTTPRequestHandler):
     def do_GET(self):
         """Handle GET requests for today's entries"""
         try:
-            entries = get_today_entries()
+            summary = get_today_summary()
             
             response_data = {
                 'success': True,
                 'date': datetime.now().strftime('%Y-%m-%d'),
-                'entries': entries
+                'entries': summary['entries'],
+                'totals': summary['totals']
             }
             
             self.send_response(200)
@@ -7,7 +7,7 @@ from http.server import BaseHTTPRequestHandler
 # Add shared directory to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'shared'))
 
-from supabase_storage import _get_supabase_client
+from supabase_storage import _get_supabase_client, _delete_entry_query
 
 class handler(BaseHTTPRequestHandler):
     def do_DELETE(self):
@@ -23,15 +23,15 @@ class handler(BaseHTTPRequestHandler):
             
             entry_id = entry_id_match.group(1)
             
-            # Delete from Supabase - try session_id first, then id
+            # Delete from Supabase by session (cascading to its entries) or by individual entry id
             supabase = _get_supabase_client()
+            try:
+                query = _delete_entry_query(supabase, entry_id)
+            except ValueError:
+                self.send_error_response(400, "Invalid entry ID format")
+                return
             
-            # First try to delete by session_id (for grouped entries)
-            result = supabase.table("food_entries").delete().eq("session_id", entry_id).execute()
-            
-            # If no rows deleted by session_id, try by id (for individual entries)
-            if not result.data:
-                result = supabase.table("food_entries").delete().eq("id", entry_id).execute()
+            result = query.execute()
             
             if not result.data:
                 self.send_error_response(404, "Entry not found")
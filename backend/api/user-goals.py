@@ -4,7 +4,6 @@
 from flask import Flask, request, jsonify
 import os
 import sys
-from datetime import datetime
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -13,7 +12,7 @@ load_dotenv()
 # Add shared directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'shared'))
 
-from supabase_storage import _get_supabase_client
+from supabase_storage import _get_supabase_client, update_user_goals, USER_GOALS_COLUMNS
 
 app = Flask(__name__)
 
@@ -23,7 +22,7 @@ def get_user_goals():
         supabase = _get_supabase_client()
         
         # Get the most recent goals entry (there should typically be only one)
-        result = supabase.table("user_goals").select("*").order("created_at", desc=True).limit(1).execute()
+        result = supabase.table("user_goals").select(USER_GOALS_COLUMNS).order("created_at", desc=True).limit(1).execute()
         
         if result.data:
             return result.data[0]
@@ -42,36 +41,6 @@ def get_user_goals():
         print(f"Error retrieving user goals: {e}")
         return None
 
-def update_user_goals(goals_data: dict) -> bool:
-    """Update or insert user goals"""
-    try:
-        supabase = _get_supabase_client()
-        
-        # Check if goals already exist
-        existing = supabase.table("user_goals").select("id").limit(1).execute()
-        
-        goals_update = {
-            "calorie_goal": goals_data.get("calorie_goal", 1800),
-            "protein_goal": goals_data.get("protein_goal", 160.0),
-            "weight_goal_kg": goals_data.get("weight_goal_kg", 70.0),
-            "updated_at": datetime.now().isoformat()
-        }
-        
-        if existing.data:
-            # Update existing goals
-            goal_id = existing.data[0]['id']
-            result = supabase.table("user_goals").update(goals_update).eq("id", goal_id).execute()
-        else:
-            # Insert new goals
-            goals_update["created_at"] = datetime.now().isoformat()
-            result = supabase.table("user_goals").insert(goals_update).execute()
-        
-        return True
-        
-    except Exception as e:
-        print(f"Error updating user goals: {e}")
-        return False
-
 @app.route('/api/user-goals', methods=['GET'])
 def get_user_goals_endpoint():
     """GET /api/user-goals - Fetch current user goals"""
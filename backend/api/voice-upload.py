@@ -10,7 +10,7 @@ from http.server import BaseHTTPRequestHandler
 # Add shared directory to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'shared'))
 
-from transcription import transcribe_file
+from transcription import transcribe_file, SUPPORTED_FORMATS
 from processing import process_food_text
 from supabase_storage import store_food_data
 
@@ -122,8 +122,7 @@ class handler(BaseHTTPRequestHandler):
 
 def allowed_file(filename):
     """Check if file is a supported audio file"""
-    supported_formats = ['.wav', '.webm', '.mp3', '.m4a', '.ogg']
-    return any(filename.lower().endswith(fmt) for fmt in supported_formats)
+    return filename.lower().endswith(SUPPORTED_FORMATS)
 
 def secure_filename(filename):
     """Basic secure filename function"""
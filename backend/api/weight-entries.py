@@ -13,7 +13,7 @@ load_dotenv()
 # Add shared directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'shared'))
 
-from supabase_storage import _get_supabase_client
+from supabase_storage import _get_supabase_client, WEIGHT_ENTRY_COLUMNS
 
 app = Flask(__name__)
 
@@ -42,13 +42,13 @@ def get_weight_entries(start_date: str = None, end_date: str = None, limit: int
     try:
         supabase = _get_supabase_client()
         
-        query = supabase.table("weight_entries").select("*")
+        query = supabase.table("weight_entries").select(WEIGHT_ENTRY_COLUMNS)
         
         if start_date:
-            query = query.gte("created_at", f"{start_date}T00:00:00")
+            query = query.gte("created_at_date", start_date)
         
         if end_date:
-            query = query.lte("created_at", f"{end_date}T23:59:59")
+            query = query.lte("created_at_date", end_date)
             
         query = query.order("created_at", desc=False).limit(limit)
         
@@ -13,7 +13,7 @@ load_dotenv()
 # Add shared directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'shared'))
 
-from supabase_storage import _get_supabase_client
+from supabase_storage import _get_supabase_client, WEIGHT_ENTRY_COLUMNS
 
 app = Flask(__name__)
 
@@ -42,9 +42,9 @@ def get_weight_history_by_period(period: str, start_date: str = None, end_date:
         
         # Query weight entries in date range
         result = supabase.table("weight_entries") \
-            .select("*") \
-            .gte("created_at", f"{start_date}T00:00:00") \
-            .lte("created_at", f"{end_date}T23:59:59") \
+            .select(WEIGHT_ENTRY_COLUMNS) \
+            .gte("created_at_date", start_date) \
+            .lte("created_at_date", end_date) \
             .order("created_at", desc=False) \
             .execute()
         
@@ -74,7 +74,7 @@ def get_latest_weight() -> dict:
         supabase = _get_supabase_client()
         
         result = supabase.table("weight_entries") \
-            .select("*") \
+            .select(WEIGHT_ENTRY_COLUMNS) \
             .order("created_at", desc=True) \
             .limit(1) \
             .execute()
@@ -5,7 +5,7 @@ from flask import Flask, render_template, request, jsonify
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
 from dotenv import load_dotenv
-from transcription import transcribe_file
+from transcription import transcribe_file, SUPPORTED_FORMATS
 from processing import process_food_text
 from storage import store_food_data, get_today_entries, get_daily_totals, delete_entry, update_entry_quantity
 
@@ -26,8 +26,7 @@ CORS(app, resources={
 
 def allowed_file(filename):
     """Check if file is a supported audio file"""
-    supported_formats = ['.wav', '.webm', '.mp3', '.m4a', '.ogg']
-    return any(filename.lower().endswith(fmt) for fmt in supported_formats)
+    return filename.lower().endswith(SUPPORTED_FORMATS)
 
 # Web Interface Routes (keep original for backward compatibility)
 @app.route('/')
@@ -3,7 +3,6 @@
 
 import os
 import sys
-import uuid
 from datetime import datetime, timedelta
 from collections import defaultdict
 from dotenv import load_dotenv
@@ -14,7 +13,7 @@ load_dotenv()
 # Add shared directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), "shared"))
 
-from supabase_storage import _get_supabase_client
+from supabase_storage import _get_supabase_client, store_food_data
 
 def analyze_duplicate_calories(days_back=7):
     """Analyze current food entries to identify duplicates for past N days"""
@@ -117,7 +116,6 @@ def create_daily_calorie_summaries(dates_to_consolidate, daily_totals):
         return 0
     
     try:
-        supabase = _get_supabase_client()
         created_count = 0
         
         print(f"\n📝 Creating daily summary entries...")
@@ -125,26 +123,23 @@ def create_daily_calorie_summaries(dates_to_consolidate, daily_totals):
         for entry_date in dates_to_consolidate:
             totals = daily_totals[entry_date]
             
-            # Create a daily summary entry with proper UUID
-            summary_entry = {
-                "session_id": str(uuid.uuid4()),  # Generate a proper UUID
-                "food_name": f"Daily Total ({entry_date})",
+            # Create a daily summary entry as its own session
+            summary_items = [{
+                "food": f"Daily Total ({entry_date})",
                 "quantity": f"{totals['entry_count']} meals/snacks",
-                "calories": totals["calories"],
-                "protein": totals["protein"],
-                "carbs": totals["carbs"],
-                "fat": totals["fat"],
-                "created_at": f"{entry_date}T12:00:00"  # Set to noon of that day
-            }
+                "macros": {
+                    "calories": totals["calories"],
+                    "protein_g": totals["protein"],
+                    "carbs_g": totals["carbs"],
+                    "fat_g": totals["fat"]
+                }
+            }]
             
             try:
-                result = supabase.table("food_entries").insert(summary_entry).execute()
-                
-                if result.data:
-                    created_count += 1
-                    print(f"  ✅ Created daily summary for {entry_date}: {totals['calories']} cal, {totals['protein']:.1f}g protein")
-                else:
-                    print(f"  ❌ Failed to create summary for {entry_date}")
+                # Set to noon of that day
+                store_food_data(summary_items, datetime.fromisoformat(f"{entry_date}T12:00:00"))
+                created_count += 1
+                print(f"  ✅ Created daily summary for {entry_date}: {totals['calories']} cal, {totals['protein']:.1f}g protein")
             except Exception as e:
                 print(f"  ❌ Error creating summary for {entry_date}: {e}")
         
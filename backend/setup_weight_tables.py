@@ -77,8 +77,8 @@ def insert_default_goals():
     try:
         supabase = _get_supabase_client()
         
-        # Check if goals already exist
-        result = supabase.table("user_goals").select("*").execute()
+        # Check if goals already exist (one row is enough to show)
+        result = supabase.table("user_goals").select("*").limit(1).execute()
         if result.data:
             print("✅ Default goals already exist")
             print(f"Current goals: {result.data[0]}")
@@ -91,9 +91,10 @@ def insert_default_goals():
             "weight_goal_kg": 70.0
         }
         
+        # The insert returns the stored row, so no read-back is needed
         result = supabase.table("user_goals").insert(goal_data).execute()
         print("✅ Default goals inserted successfully")
-        print(f"Inserted: {goal_data}")
+        print(f"Inserted: {result.data[0]}")
         return True
         
     except Exception as e:
@@ -110,11 +111,16 @@ def insert_sample_weight_data():
     try:
         supabase = _get_supabase_client()
         
-        # Check if sample data already exists
-        result = supabase.table("weight_entries").select("*").execute()
+        # Check if sample data already exists, fetching only the rows shown plus a count
+        result = (
+            supabase.table("weight_entries")
+            .select("created_at,weight_kg", count="exact")
+            .limit(3)
+            .execute()
+        )
         if result.data:
-            print(f"✅ Weight entries already exist ({len(result.data)} entries)")
-            for entry in result.data[:3]:  # Show first 3
+            print(f"✅ Weight entries already exist ({result.count} entries)")
+            for entry in result.data:  # Show first 3
                 print(f"  - {entry['created_at']}: {entry['weight_kg']} kg")
             return True
         
@@ -130,7 +136,7 @@ def insert_sample_weight_data():
         
         result = supabase.table("weight_entries").insert(sample_data).execute()
         print("✅ Sample weight data inserted successfully")
-        print(f"Inserted {len(sample_data)} weight entries")
+        print(f"Inserted {len(result.data)} weight entries")
         return True
         
     except Exception as e:
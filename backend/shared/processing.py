@@ -1,7 +1,10 @@
 import os
 import json
+import functools
 import yaml
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from groq import Groq
 from dotenv import load_dotenv
 
@@ -16,8 +19,9 @@ def _load_prompt() -> str:
         prompts = yaml.safe_load(file)
         return prompts['food_parsing_prompt']
 
+@functools.lru_cache(maxsize=1)
 def _load_nutrition_database() -> dict:
-    """Load the nutrition database from JSON file"""
+    """Load the nutrition database from JSON file once per process (callers must not mutate it)"""
     # Get the directory of this file and build absolute path
     current_dir = os.path.dirname(os.path.abspath(__file__))
     db_path = os.path.join(current_dir, "data", "nutrition_db.json")
@@ -114,6 +118,21 @@ def _calculate_macros(nutrition_per_100g: dict, quantity_str: str) -> dict:
         "fat_g": round(nutrition_per_100g["fat_g"] * scaling_factor, 1)
     }
 
+_usda_client = None
+_usda_client_lock = threading.Lock()
+
+# Items in one meal are looked up concurrently; matches the USDA client's connection pool size
+_NUTRITION_POOL = ThreadPoolExecutor(max_workers=10)
+
+def _get_usda_client():
+    """Get the shared USDA client so its pooled connections are reused across lookups"""
+    global _usda_client
+    with _usda_client_lock:
+        if _usda_client is None:
+            from usda_client import USDAClient
+            _usda_client = USDAClient()
+    return _usda_client
+
 def _lookup_nutrition(food_name: str, quantity: str) -> dict:
     """
     Look up nutrition information for a food item
@@ -121,14 +140,13 @@ def _lookup_nutrition(food_name: str, quantity: str) -> dict:
     """
     # First, try USDA API
     try:
-        from usda_client import USDAClient, parse_quantity_to_grams
+        from usda_client import parse_quantity_to_grams
         
         # Convert quantity string to grams for USDA API
         quantity_g = parse_quantity_to_grams(quantity)
         
         # Get nutrition from USDA
-        usda_client = USDAClient()
-        usda_nutrition = usda_client.get_nutrition(food_name, quantity_g)
+        usda_nutrition = _get_usda_client().get_nutrition(food_name, quantity_g)
         
         # If USDA returned valid data, use it
         if usda_nutrition and usda_nutrition.get("source") == "usda":
@@ -240,11 +258,12 @@ def process_food_text(text: str) -> dict:
             "error": "Parser failed - used fallback"
         }
     
-    # Add nutrition information to each food item
+    # Add nutrition information to each food item, looking all items up at once
     if 'items' in parsed_data:
-        for item in parsed_data['items']:
-            if 'food' in item and 'quantity' in item:
-                item['macros'] = _lookup_nutrition(item['food'], item['quantity'])
+        items = [item for item in parsed_data['items'] if 'food' in item and 'quantity' in item]
+        lookups = _NUTRITION_POOL.map(lambda item: _lookup_nutrition(item['food'], item['quantity']), items)
+        for item, macros in zip(items, lookups):
+            item['macros'] = macros
     
     return parsed_data
 
@@ -1,39 +1,210 @@
-import json
+import contextlib
+import fcntl
 import os
+import re
+import threading
 import uuid
 from datetime import datetime
+import orjson
+from cachetools import LRUCache
 from meal_detection import detect_meal_time, get_meal_emoji
+from processing import process_food_text
+
+LOGS_DIR = 'logs'
+
+# Parsed log files keyed by path, as ((mtime_ns, size), parsed); a date has up to three files
+_PARSED_FILES = LRUCache(maxsize=192)
+_PARSED_FILES_LOCK = threading.Lock()
+
+# A quantity that is just a number and a unit, e.g. "150g" or "2 cups"
+_QUANTITY_WITH_UNIT = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*([a-zA-Z]+)\s*$')
 
 def _calculate_daily_totals(entries: list) -> dict:
     """Calculate total macros for all entries in a day"""
-    totals = {
-        "calories": 0,
-        "protein_g": 0,
-        "carbs_g": 0,
-        "fat_g": 0
-    }
-    
-    for entry in entries:
-        if 'items' in entry:
-            for item in entry['items']:
-                if 'macros' in item:
-                    macros = item['macros']
-                    totals["calories"] += macros.get("calories", 0)
-                    totals["protein_g"] += macros.get("protein_g", 0)
-                    totals["carbs_g"] += macros.get("carbs_g", 0)
-                    totals["fat_g"] += macros.get("fat_g", 0)
+    # Collect every item's macros once, then let sum() do each total
+    all_macros = [
+        item['macros']
+        for entry in entries
+        for item in entry.get('items', ())
+        if item.get('macros')
+    ]
     
     # Round the totals
     return {
-        "calories": round(totals["calories"]),
-        "protein_g": round(totals["protein_g"], 1),
-        "carbs_g": round(totals["carbs_g"], 1),
-        "fat_g": round(totals["fat_g"], 1)
+        "calories": round(_sum_macro(all_macros, "calories")),
+        "protein_g": round(_sum_macro(all_macros, "protein_g"), 1),
+        "carbs_g": round(_sum_macro(all_macros, "carbs_g"), 1),
+        "fat_g": round(_sum_macro(all_macros, "fat_g"), 1)
+    }
+
+def _sum_macro(all_macros: list, key: str) -> float:
+    """Sum one macro across items, indexing directly since the pipeline always writes all four"""
+    try:
+        return sum(macros[key] for macros in all_macros)
+    except KeyError:
+        # Some stored entries are missing a macro
+        return sum(macros.get(key, 0) for macros in all_macros)
+
+def _add_totals(totals: dict, delta: dict) -> dict:
+    """Add one set of macro totals to another, rounded like _calculate_daily_totals"""
+    return {
+        "calories": round(totals["calories"] + delta["calories"]),
+        "protein_g": round(totals["protein_g"] + delta["protein_g"], 1),
+        "carbs_g": round(totals["carbs_g"] + delta["carbs_g"], 1),
+        "fat_g": round(totals["fat_g"] + delta["fat_g"], 1)
     }
 
+def _today() -> str:
+    """Today's date as YYYY-MM-DD"""
+    return datetime.now().date().isoformat()
+
+def _log_path(date: str) -> str:
+    """Append-only JSONL log for a date (YYYY-MM-DD), one entry per line"""
+    return os.path.join(LOGS_DIR, f"logs_{date}.jsonl")
+
+def _totals_path(date: str) -> str:
+    """Sidecar file holding a date's running macro totals"""
+    return os.path.join(LOGS_DIR, f"logs_{date}.totals.json")
+
+def _json_log_path(date: str) -> str:
+    """Whole-file JSON log for a date, read before the date's JSONL log"""
+    return os.path.join(LOGS_DIR, f"logs_{date}.json")
+
+def _read_parsed(filepath: str, parse, use_cache: bool = True):
+    """
+    Read and parse a log file, or return None if it does not exist
+    
+    A single stat() both detects a missing file and versions the cache, and the
+    parsed result is reused while the file's mtime and size are unchanged. Cached results are shared,
+    so callers that modify them must pass use_cache=False, which reads a private
+    copy and drops the file's cache entry.
+    """
+    try:
+        stat = os.stat(filepath)
+    except FileNotFoundError:
+        with _PARSED_FILES_LOCK:
+            _PARSED_FILES.pop(filepath, None)
+        return None
+    
+    version = (stat.st_mtime_ns, stat.st_size)
+    if not use_cache:
+        # The caller is about to modify the parse and rewrite the file, so the
+        # cache keeps neither it nor a stale parse the rewrite might not re-version
+        with _PARSED_FILES_LOCK:
+            _PARSED_FILES.pop(filepath, None)
+        with open(filepath, 'rb') as file:
+            return parse(file.read())
+    
+    with _PARSED_FILES_LOCK:
+        cached = _PARSED_FILES.get(filepath)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    
+    with open(filepath, 'rb') as file:
+        parsed = parse(file.read())
+    with _PARSED_FILES_LOCK:
+        _PARSED_FILES[filepath] = (version, parsed)
+    return parsed
+
+def _parse_json_log(data: bytes) -> list:
+    """Parse entries from a whole-file JSON log"""
+    if not data:
+        return []
+    
+    try:
+        data = orjson.loads(data)
+    except orjson.JSONDecodeError:
+        return []
+    
+    # Handle both old format (list) and new format (dict with entries)
+    if isinstance(data, list):
+        return data  # Old format - direct list of entries
+    elif isinstance(data, dict) and 'entries' in data:
+        return data['entries']  # New format - entries within dict
+    else:
+        return [data]  # Single entry
+
+def _parse_jsonl_log(data: bytes) -> list:
+    """Parse entries from a JSONL log, one entry per line"""
+    entries = []
+    for line in data.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            entries.append(orjson.loads(line))
+        except orjson.JSONDecodeError:
+            continue  # Skip a line torn by an interrupted append
+    return entries
+
+def _parse_totals(data: bytes):
+    """Parse a totals sidecar, or None if it is unreadable"""
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        return None
+
+def _read_entries(date: str, use_cache: bool = True) -> list:
+    """Read all entries for a date from its JSON log followed by its JSONL log"""
+    json_entries = _read_parsed(_json_log_path(date), _parse_json_log, use_cache) or []
+    jsonl_entries = _read_parsed(_log_path(date), _parse_jsonl_log, use_cache) or []
+    return json_entries + jsonl_entries
+
+def _read_totals(date: str) -> dict:
+    """Read a date's totals from its sidecar, computing them from entries if it is missing"""
+    totals = _read_parsed(_totals_path(date), _parse_totals)
+    if totals is not None:
+        return totals
+    
+    # Reads never write; the next store, update or delete saves the sidecar
+    return _calculate_daily_totals(_read_entries(date))
+
+@contextlib.contextmanager
+def _logs_lock():
+    """Hold an exclusive lock on the logs directory, across processes, for a read-modify-write"""
+    os.makedirs(LOGS_DIR, exist_ok=True)
+    with open(os.path.join(LOGS_DIR, '.lock'), 'wb') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        yield
+
+def _atomic_write(filepath: str, data: bytes) -> None:
+    """Replace a file's contents so readers see either the old or the new file, never a partial one"""
+    temp_path = filepath + '.tmp'
+    with open(temp_path, 'wb') as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, filepath)
+
+def _rebuild_totals(date: str, entries: list) -> dict:
+    """Recompute a date's totals from all of its entries and save the sidecar (caller holds _logs_lock)"""
+    totals = _calculate_daily_totals(entries)
+    # Days with nothing logged get no files
+    if entries or os.path.exists(_totals_path(date)):
+        _write_totals(date, totals)
+    return totals
+
+def _write_totals(date: str, totals: dict) -> None:
+    """Write a date's totals sidecar"""
+    _atomic_write(_totals_path(date), orjson.dumps(totals))
+
+def _rewrite_entries(date: str, entries: list) -> None:
+    """Replace a date's logs with the given entries and rebuild its totals (caller holds _logs_lock)"""
+    _atomic_write(_log_path(date), b''.join(
+        orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE) for entry in entries
+    ))
+    
+    # The JSONL log holds every entry, including any from the whole-file JSON log
+    try:
+        os.remove(_json_log_path(date))
+    except FileNotFoundError:
+        pass
+    
+    _rebuild_totals(date, entries)
+
 def store_food_data(food_items: list, timestamp: datetime = None) -> bool:
     """
-    Store food logging entry to daily JSON file
+    Store food logging entry by appending it to the daily JSONL log
     
     Args:
         food_items: List of food items with 'food' and 'quantity' keys
@@ -64,164 +235,72 @@ def store_food_data(food_items: list, timestamp: datetime = None) -> bool:
         "items": food_items
     }
     
-    # Create logs directory if it doesn't exist
-    os.makedirs('logs', exist_ok=True)
-    
-    # Get daily log file path
-    filename = f"logs_{timestamp.strftime('%Y-%m-%d')}.json"
-    filepath = os.path.join('logs', filename)
+    date = timestamp.date().isoformat()
+    filepath = _log_path(date)
     
-    # Load existing entries or create new list
-    entries = []
-    if os.path.exists(filepath):
-        with open(filepath, 'r') as file:
-            data = json.load(file)
-            # Handle both old format (list) and new format (dict with entries)
-            if isinstance(data, list):
-                entries = data  # Old format - direct list of entries
-            elif isinstance(data, dict) and 'entries' in data:
-                entries = data['entries']  # New format - entries within dict
-            else:
-                entries = [data]  # Single entry
-    
-    # Add new entry
-    entries.append(entry)
-    
-    # Calculate daily totals and create the data structure
-    daily_totals = _calculate_daily_totals(entries)
-    daily_data = {
-        "entries": entries,
-        "daily_macros": daily_totals
-    }
-    
-    # Save updated entries with daily totals
-    with open(filepath, 'w') as file:
-        json.dump(daily_data, file, indent=2)
+    with _logs_lock():
+        totals = _read_parsed(_totals_path(date), _parse_totals)
+        if totals is None:
+            totals = _calculate_daily_totals(_read_entries(date))
+        
+        # Append the new entry as one line; earlier lines are left as they are
+        with open(filepath, 'ab') as file:
+            file.write(orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE))
+        
+        # Add only the new entry's macros to the running totals
+        _write_totals(date, _add_totals(totals, _calculate_daily_totals([entry])))
     
     print(f"Stored food entry with {len(food_items)} items to {filepath}")
     return True
 
 def get_today_entries() -> list:
     """Get all food entries for today"""
-    today = datetime.now()
-    filename = f"logs_{today.strftime('%Y-%m-%d')}.json"
-    filepath = os.path.join('logs', filename)
-    
-    if not os.path.exists(filepath):
-        return []
-    
-    # Check if file is empty
-    if os.path.getsize(filepath) == 0:
-        return []
-    
-    with open(filepath, 'r') as file:
-        try:
-            data = json.load(file)
-            # Handle both old format (list) and new format (dict with entries)
-            if isinstance(data, list):
-                return data  # Old format - direct list of entries
-            elif isinstance(data, dict) and 'entries' in data:
-                return data['entries']  # New format - entries within dict
-            else:
-                return [data]  # Single entry
-        except json.JSONDecodeError:
-            return []
+    return _read_entries(_today())
 
 def get_daily_totals() -> dict:
     """Get daily macro totals for today"""
-    today = datetime.now()
-    filename = f"logs_{today.strftime('%Y-%m-%d')}.json"
-    filepath = os.path.join('logs', filename)
-    
-    if not os.path.exists(filepath):
-        return {"calories": 0, "protein_g": 0, "carbs_g": 0, "fat_g": 0}
-    
-    # Check if file is empty
-    if os.path.getsize(filepath) == 0:
-        return {"calories": 0, "protein_g": 0, "carbs_g": 0, "fat_g": 0}
-    
-    with open(filepath, 'r') as file:
-        try:
-            data = json.load(file)
-            
-            # If new format with daily_macros, return those
-            if isinstance(data, dict) and 'daily_macros' in data:
-                return data['daily_macros']
-            
-            # Otherwise calculate from entries (backward compatibility)
-            entries = []
-            if isinstance(data, list):
-                entries = data  # Old format - direct list of entries
-            elif isinstance(data, dict) and 'entries' in data:
-                entries = data['entries']  # New format - entries within dict
-            else:
-                entries = [data]  # Single entry
-                
-            return _calculate_daily_totals(entries)
-            
-        except json.JSONDecodeError:
-            return {"calories": 0, "protein_g": 0, "carbs_g": 0, "fat_g": 0}
+    return get_daily_totals_by_date(_today())
 
 def get_entries_by_date(date: str) -> list:
     """Get food entries for a specific date (YYYY-MM-DD format)"""
-    filename = f"logs_{date}.json"
-    filepath = os.path.join('logs', filename)
-    
-    if not os.path.exists(filepath):
-        return []
-    
-    # Check if file is empty
-    if os.path.getsize(filepath) == 0:
-        return []
-    
-    with open(filepath, 'r') as file:
-        try:
-            data = json.load(file)
-            
-            # Handle different data formats
-            if isinstance(data, list):
-                return data  # Old format - direct list of entries
-            elif isinstance(data, dict) and 'entries' in data:
-                return data['entries']  # New format - entries within dict
-            else:
-                return [data]  # Single entry
-                
-        except json.JSONDecodeError:
-            return []
+    return _read_entries(date)
 
 def get_daily_totals_by_date(date: str) -> dict:
     """Get daily macro totals for a specific date (YYYY-MM-DD format)"""
-    filename = f"logs_{date}.json"
-    filepath = os.path.join('logs', filename)
-    
-    if not os.path.exists(filepath):
-        return {"calories": 0, "protein_g": 0, "carbs_g": 0, "fat_g": 0}
-    
-    # Check if file is empty
-    if os.path.getsize(filepath) == 0:
-        return {"calories": 0, "protein_g": 0, "carbs_g": 0, "fat_g": 0}
-    
-    with open(filepath, 'r') as file:
-        try:
-            data = json.load(file)
-            
-            # If new format with daily_macros, return those
-            if isinstance(data, dict) and 'daily_macros' in data:
-                return data['daily_macros']
-            
-            # Otherwise calculate from entries (backward compatibility)
-            entries = []
-            if isinstance(data, list):
-                entries = data  # Old format - direct list of entries
-            elif isinstance(data, dict) and 'entries' in data:
-                entries = data['entries']  # New format - entries within dict
-            else:
-                entries = [data]  # Single entry
-                
-            return _calculate_daily_totals(entries)
-            
-        except json.JSONDecodeError:
-            return {"calories": 0, "protein_g": 0, "carbs_g": 0, "fat_g": 0}
+    return _read_totals(date)
+
+def _matches_entry(entry: dict, entry_id: str) -> bool:
+    """Match an entry by ID, or by timestamp for entries stored without IDs"""
+    return entry.get('id') == entry_id or (entry.get('id') is None and entry.get('timestamp') == entry_id)
+
+def _find_entry(entries: list, entry_id: str):
+    """Find the first matching entry that has items, or None"""
+    for entry in entries:
+        if _matches_entry(entry, entry_id) and entry.get('items'):
+            return entry
+    return None
+
+def _scaled_macros(item: dict, new_quantity: str):
+    """Scale an item's macros to a quantity in the same unit, or None if they can't be scaled linearly"""
+    macros = item.get('macros')
+    old_match = _QUANTITY_WITH_UNIT.match(item.get('quantity') or '')
+    new_match = _QUANTITY_WITH_UNIT.match(new_quantity)
+    if not macros or not old_match or not new_match:
+        return None
+    # Singular and plural units match, e.g. "1 cup" and "2 cups"
+    if old_match.group(2).lower().rstrip('s') != new_match.group(2).lower().rstrip('s'):
+        return None
+    
+    old_value = float(old_match.group(1))
+    if old_value == 0:
+        return None
+    ratio = float(new_match.group(1)) / old_value
+    
+    scaled = dict(macros)
+    scaled["calories"] = round(macros.get("calories", 0) * ratio)
+    for key in ("protein_g", "carbs_g", "fat_g"):
+        scaled[key] = round(macros.get(key, 0) * ratio, 1)
+    return scaled
 
 def delete_entry(entry_id: str) -> bool:
     """
@@ -233,46 +312,24 @@ def delete_entry(entry_id: str) -> bool:
     Returns:
         True if deleted successfully, False if entry not found
     """
-    today = datetime.now()
-    filename = f"logs_{today.strftime('%Y-%m-%d')}.json"
-    filepath = os.path.join('logs', filename)
-    
-    if not os.path.exists(filepath):
+    date = _today()
+    if not _read_entries(date):
         return False
     
-    with open(filepath, 'r') as file:
-        try:
-            data = json.load(file)
-            if not isinstance(data, dict) or 'entries' not in data:
-                return False
-                
-            entries = data['entries']
-            # Find and remove entry with matching ID or timestamp (for legacy entries without IDs)
-            original_count = len(entries)
-            entries = [entry for entry in entries if not (
-                entry.get('id') == entry_id or 
-                (entry.get('id') is None and entry.get('timestamp') == entry_id)
-            )]
-            
-            if len(entries) == original_count:
-                return False  # Entry not found
-            
-            # Recalculate daily totals
-            daily_totals = _calculate_daily_totals(entries)
-            updated_data = {
-                "entries": entries,
-                "daily_macros": daily_totals
-            }
-            
-            # Save updated data
-            with open(filepath, 'w') as file:
-                json.dump(updated_data, file, indent=2)
-            
-            print(f"Deleted entry with ID/timestamp {entry_id}")
-            return True
-            
-        except json.JSONDecodeError:
-            return False
+    with _logs_lock():
+        # _read_entries builds a fresh list, so removing from it leaves the cache intact
+        entries = _read_entries(date)
+        
+        # Find and remove entry with matching ID or timestamp (for entries without IDs)
+        index = next((i for i, entry in enumerate(entries) if _matches_entry(entry, entry_id)), None)
+        if index is None:
+            return False  # Entry not found
+        del entries[index]
+        
+        _rewrite_entries(date, entries)
+    
+    print(f"Deleted entry with ID/timestamp {entry_id}")
+    return True
 
 def update_entry_quantity(entry_id: str, new_quantity: str) -> bool:
     """
@@ -285,68 +342,48 @@ def update_entry_quantity(entry_id: str, new_quantity: str) -> bool:
     Returns:
         True if updated successfully, False if entry not found
     """
-    today = datetime.now()
-    filename = f"logs_{today.strftime('%Y-%m-%d')}.json"
-    filepath = os.path.join('logs', filename)
-    
-    if not os.path.exists(filepath):
+    date = _today()
+    entry = _find_entry(_read_entries(date), entry_id)
+    if entry is None:
         return False
     
-    with open(filepath, 'r') as file:
+    processed_items = []
+    # Same-unit changes like "150g" -> "200g" just scale the macros, so only reprocess otherwise
+    if _scaled_macros(entry['items'][0], new_quantity) is None:
+        # Re-process the entry to recalculate macros
+        # Create a text representation for reprocessing
+        food_name = entry['items'][0]['food']
+        text_for_processing = f"{new_quantity} of {food_name}"
+        
         try:
-            data = json.load(file)
-            if not isinstance(data, dict) or 'entries' not in data:
-                return False
-                
-            entries = data['entries']
-            entry_found = False
-            
-            # Find and update entry with matching ID or timestamp (for legacy entries without IDs)
-            for entry in entries:
-                if entry.get('id') == entry_id or (entry.get('id') is None and entry.get('timestamp') == entry_id):
-                    if 'items' in entry and len(entry['items']) > 0:
-                        # Update quantity of the first (and typically only) item
-                        entry['items'][0]['quantity'] = new_quantity
-                        entry_found = True
-                        break
-            
-            if not entry_found:
-                return False
-            
-            # Re-process the entry to recalculate macros
-            # Import processing here to avoid circular imports
-            from processing import process_food_text
-            
-            # Create a text representation for reprocessing
-            food_name = entry['items'][0]['food']
-            text_for_processing = f"{new_quantity} of {food_name}"
-            
-            try:
-                # Reprocess to get new macros
-                processed_data = process_food_text(text_for_processing)
-                if processed_data['items']:
-                    # Update the entry with new macros
-                    entry['items'][0]['macros'] = processed_data['items'][0].get('macros')
-            except Exception as e:
-                print(f"Warning: Could not recalculate macros for updated quantity: {e}")
-                # Continue without macro update
-            
-            # Recalculate daily totals
-            daily_totals = _calculate_daily_totals(entries)
-            updated_data = {
-                "entries": entries,
-                "daily_macros": daily_totals
-            }
-            
-            # Save updated data
-            with open(filepath, 'w') as file:
-                json.dump(updated_data, file, indent=2)
-            
-            print(f"Updated entry {entry_id} with new quantity: {new_quantity}")
-            return True
-            
-        except json.JSONDecodeError:
-            return False
+            # Reprocess to get new macros
+            processed_items = process_food_text(text_for_processing)['items']
+        except Exception as e:
+            print(f"Warning: Could not recalculate macros for updated quantity: {e}")
+            # Continue without macro update
+    
+    # Reprocessing calls the LLM, so the lock is only taken for the rewrite
+    with _logs_lock():
+        # Entries are edited in place, so read them fresh rather than from the shared cache
+        entries = _read_entries(date, use_cache=False)
+        entry = _find_entry(entries, entry_id)
+        if entry is None:
+            return False  # Deleted while reprocessing
+        
+        # Update quantity of the first (and typically only) item
+        item = entry['items'][0]
+        scaled_macros = _scaled_macros(item, new_quantity)
+        item['quantity'] = new_quantity
+        if scaled_macros is not None:
+            item['macros'] = scaled_macros
+        elif processed_items:
+            # Update the entry with new macros
+            item['macros'] = processed_items[0].get('macros')
+        
+        _rewrite_entries(date, entries)
+    
+    print(f"Updated entry {entry_id} with new quantity: {new_quantity}")
+    return True
 
 if __name__ == "__main__":
     # Test the storage system
@@ -1,46 +1,262 @@
 import os
+import re
+import threading
 import uuid
-from datetime import datetime
-from supabase import create_client, Client
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from operator import itemgetter
+from cachetools import TTLCache
+from supabase import create_client, acreate_client, Client
 from meal_detection import detect_meal_time, get_meal_emoji
 
-# Initialize Supabase client
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
+# Columns read back from each table
+FOOD_SESSION_COLUMNS = "id,created_at,meal_type,meal_emoji,food_entries!inner(food_name,quantity,calories,protein,carbs,fat)"
+WEIGHT_ENTRY_COLUMNS = "id,weight_kg,created_at,notes"
+USER_GOALS_COLUMNS = "id,calorie_goal,protein_goal,weight_goal_kg,created_at,updated_at"
+DAILY_TOTALS_COLUMNS = "calories,protein,carbs,fat"
+
+# Session IDs are uuid4 strings; anything else reaching a filter is rejected
+SESSION_ID_PATTERN = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.IGNORECASE)
+
+# Pulls the item fields out of an embedded food_entries row in one call
+_item_fields = itemgetter("food_name", "quantity", "calories", "protein", "carbs", "fat")
+
+# Rows per insert request when storing many sessions at once
+BULK_INSERT_CHUNK_SIZE = 1000
+# Sessions per range request when reading a day's entries
+SESSIONS_PAGE_SIZE = 500
+DB_APPLICATION_NAME = "voice_food_logger"
+FOOD_SESSION_COPY_COLUMNS = ("id", "created_at", "meal_type", "meal_emoji")
+FOOD_ENTRY_COPY_COLUMNS = ("food_name", "quantity", "calories", "protein", "carbs", "fat", "session_id", "created_at")
+
+# Goals are read on every screen refresh but written rarely. Each API route runs
+# as its own function, so a write elsewhere shows up here once the TTL expires.
+_GOALS_CACHE_LOCK = threading.Lock()
+_GOALS_CACHE = TTLCache(maxsize=1, ttl=60)
+
+# Shared pool for fanning out independent Supabase round-trips
+_POOL = ThreadPoolExecutor(max_workers=8)
+
+# Credentials are read from the environment on first use, then reused with one sync client
+_CLIENT_LOCK = threading.Lock()
+_credentials = None
+_client = None
+
+def _supabase_credentials() -> tuple:
+    """Read SUPABASE_URL and SUPABASE_KEY once, raising if either is missing"""
+    global _credentials
+    if _credentials is None:
+        with _CLIENT_LOCK:
+            if _credentials is None:
+                url = os.getenv("SUPABASE_URL")
+                key = os.getenv("SUPABASE_KEY")
+                if not url or not key:
+                    raise ValueError("SUPABASE_URL and SUPABASE_KEY environment variables are required")
+                _credentials = (url, key)
+    return _credentials
 
 def _get_supabase_client():
-    """Get initialized Supabase client"""
-    if not SUPABASE_URL or not SUPABASE_KEY:
-        raise ValueError("SUPABASE_URL and SUPABASE_KEY environment variables are required")
-    return create_client(SUPABASE_URL, SUPABASE_KEY)
+    """Get the shared Supabase client, creating it on first use"""
+    global _client
+    if _client is None:
+        url, key = _supabase_credentials()
+        with _CLIENT_LOCK:
+            if _client is None:
+                _client = create_client(url, key)
+    return _client
 
-def _calculate_daily_totals(entries: list) -> dict:
-    """Calculate total macros for all entries in a day (same as original)"""
-    totals = {
-        "calories": 0,
-        "protein_g": 0,
-        "carbs_g": 0,
-        "fat_g": 0
+async def _get_async_supabase_client(supabase=None):
+    """
+    Get an async Supabase client for use with asyncio.gather
+    
+    Async clients are bound to the running event loop, so only credentials are
+    shared module-wide. Callers gathering several reads create one client and pass
+    it to each coroutine so they share its connection pool; an existing client
+    passed here is returned as is.
+    """
+    if supabase is not None:
+        return supabase
+    return await acreate_client(*_supabase_credentials())
+
+def _cached_user_goals():
+    """Get a copy of the cached user goals, or None on a miss"""
+    with _GOALS_CACHE_LOCK:
+        goals = _GOALS_CACHE.get("user_goals")
+    return dict(goals) if goals is not None else None
+
+def _cache_user_goals(goals: dict):
+    """Cache a copy of the user goals so callers can't mutate the cached value"""
+    with _GOALS_CACHE_LOCK:
+        _GOALS_CACHE["user_goals"] = dict(goals)
+
+def _invalidate_user_goals():
+    """Drop the cached user goals"""
+    with _GOALS_CACHE_LOCK:
+        _GOALS_CACHE.pop("user_goals", None)
+
+def _entry_id_column(entry_id: str) -> str:
+    """Column an entry ID refers to: numeric row IDs are 'id', session UUIDs are 'session_id'"""
+    if entry_id.isdigit():
+        return "id"
+    if SESSION_ID_PATTERN.fullmatch(entry_id):
+        return "session_id"
+    raise ValueError(f"Invalid entry ID: {entry_id!r}")
+
+def _delete_entry_query(supabase, entry_id: str):
+    """Build the delete for an entry ID: a session UUID deletes its food_sessions row and cascades to its entries"""
+    id_column = _entry_id_column(entry_id)
+    if id_column == "session_id":
+        return supabase.table("food_sessions").delete().eq("id", entry_id)
+    return supabase.table("food_entries").delete().eq(id_column, entry_id)
+
+def _default_user_goals() -> dict:
+    """Goals returned when none have been saved yet"""
+    return {
+        "calorie_goal": 1800,
+        "protein_goal": 160.0,
+        "weight_goal_kg": 70.0
     }
+
+def _sessions_by_date_query(supabase, date):
+    """Build the query for one day's food sessions with their entries embedded (sync or async client)"""
+    return supabase.table("food_sessions") \
+        .select(FOOD_SESSION_COLUMNS) \
+        .eq("created_at_date", str(date)) \
+        .order("created_at", desc=False) \
+        .order("id", desc=False) \
+        .order("id", desc=False, foreign_table="food_entries")
+
+def _iter_sessions_by_date(supabase, date, page_size: int = SESSIONS_PAGE_SIZE):
+    """Yield one day's food sessions a page at a time so only one page is decoded at once"""
+    offset = 0
+    while True:
+        rows = _sessions_by_date_query(supabase, date).range(offset, offset + page_size - 1).execute().data
+        yield from rows
+        if len(rows) < page_size:
+            return
+        offset += page_size
+
+async def _aiter_sessions_by_date(supabase, date, page_size: int = SESSIONS_PAGE_SIZE):
+    """Async variant of _iter_sessions_by_date"""
+    offset = 0
+    while True:
+        rows = (await _sessions_by_date_query(supabase, date).range(offset, offset + page_size - 1).execute()).data
+        for row in rows:
+            yield row
+        if len(rows) < page_size:
+            return
+        offset += page_size
+
+def _daily_totals_query(supabase, date):
+    """Build the food_entries_daily lookup for one day's summed macros (sync or async client)"""
+    return supabase.table("food_entries_daily") \
+        .select(DAILY_TOTALS_COLUMNS) \
+        .eq("day", str(date))
+
+def _user_goals_query(supabase):
+    """Build the query for the most recent user goals (sync or async client)"""
+    return supabase.table("user_goals") \
+        .select(USER_GOALS_COLUMNS) \
+        .order("created_at", desc=True) \
+        .limit(1)
+
+def _weight_entries_query(supabase, start_date: str, end_date: str):
+    """Build the query for weight entries in a date range (sync or async client)"""
+    return supabase.table("weight_entries") \
+        .select(WEIGHT_ENTRY_COLUMNS) \
+        .gte("created_at_date", start_date) \
+        .lte("created_at_date", end_date) \
+        .order("created_at", desc=False)
+
+def _weight_period_range(period: str) -> tuple:
+    """Get (start_date, end_date) ISO strings for a chart period"""
+    now = datetime.now()
+    
+    if period == "today":
+        start_date = now.date().isoformat()
+    elif period == "month":
+        start_date = (now - timedelta(days=30)).date().isoformat()
+    else:
+        # "week" and unknown periods
+        start_date = (now - timedelta(days=7)).date().isoformat()
     
-    for entry in entries:
-        if 'items' in entry:
-            for item in entry['items']:
-                if 'macros' in item:
-                    macros = item['macros']
-                    totals["calories"] += macros.get("calories", 0)
-                    totals["protein_g"] += macros.get("protein_g", 0)
-                    totals["carbs_g"] += macros.get("carbs_g", 0)
-                    totals["fat_g"] += macros.get("fat_g", 0)
+    return start_date, now.date().isoformat()
+
+def _item_from_row(row: dict) -> dict:
+    """Convert a food_entries row into a session item"""
+    food, quantity, calories, protein, carbs, fat = _item_fields(row)
+    return {
+        "food": food,
+        "quantity": quantity,
+        "macros": {
+            "calories": calories,
+            "protein_g": protein,
+            "carbs_g": carbs,
+            "fat_g": fat
+        }
+    }
+
+def _session_from_row(row: dict) -> dict:
+    """Convert a food_sessions row with embedded food_entries into a UI session"""
+    return {
+        "id": row["id"],
+        "timestamp": row["created_at"],
+        "meal_type": row["meal_type"],
+        "meal_emoji": row["meal_emoji"],
+        "items": [_item_from_row(item) for item in row["food_entries"]]
+    }
+
+def _totals_from_daily_row(rows: list) -> dict:
+    """Round the food_entries_daily row into daily totals (days without entries have no row)"""
+    row = rows[0] if rows else {}
+    return {
+        "calories": round(row.get("calories") or 0),
+        "protein_g": round(row.get("protein") or 0, 1),
+        "carbs_g": round(row.get("carbs") or 0, 1),
+        "fat_g": round(row.get("fat") or 0, 1)
+    }
+
+def _calculate_daily_totals(entries: list) -> dict:
+    """Calculate total macros for all entries in a day (same as original)"""
+    macros_list = [item['macros'] for entry in entries if 'items' in entry
+                   for item in entry['items'] if 'macros' in item]
     
     # Round the totals
     return {
-        "calories": round(totals["calories"]),
-        "protein_g": round(totals["protein_g"], 1),
-        "carbs_g": round(totals["carbs_g"], 1),
-        "fat_g": round(totals["fat_g"], 1)
+        "calories": round(sum(macros.get("calories", 0) for macros in macros_list)),
+        "protein_g": round(sum(macros.get("protein_g", 0) for macros in macros_list), 1),
+        "carbs_g": round(sum(macros.get("carbs_g", 0) for macros in macros_list), 1),
+        "fat_g": round(sum(macros.get("fat_g", 0) for macros in macros_list), 1)
+    }
+
+def _food_session_row(session_id: str, timestamp: datetime) -> dict:
+    """Build the food_sessions row for one recording, with its meal type fixed at write time"""
+    meal_type = detect_meal_time(timestamp)
+    return {
+        "id": session_id,
+        "created_at": timestamp.isoformat(),
+        "meal_type": meal_type,
+        "meal_emoji": get_meal_emoji(meal_type)
     }
 
+def _food_entry_rows(food_items: list, session_id: str, timestamp: datetime) -> list:
+    """Build food_entries rows for one session - each food item gets its own row"""
+    created_at = timestamp.isoformat()
+    rows = []
+    for item in food_items:
+        macros = item.get('macros', {})
+        rows.append({
+            "food_name": item.get("food"),
+            "quantity": item.get("quantity"),
+            "calories": macros.get("calories") or 0,
+            "protein": macros.get("protein_g") or 0,
+            "carbs": macros.get("carbs_g") or 0,
+            "fat": macros.get("fat_g") or 0,
+            "session_id": session_id,
+            "created_at": created_at
+        })
+    return rows
+
 def store_food_data(food_items: list, timestamp: datetime = None) -> bool:
     """
     Store food logging entry to Supabase database
@@ -64,31 +280,21 @@ def store_food_data(food_items: list, timestamp: datetime = None) -> bool:
     # Generate session ID to group items from same recording
     session_id = str(uuid.uuid4())
     
-    # Detect meal type based on timestamp
-    meal_type = detect_meal_time(timestamp)
-    meal_emoji = get_meal_emoji(meal_type)
-    
     try:
         supabase = _get_supabase_client()
         
+        # The session row carries the meal type and must exist before its entries
+        supabase.table("food_sessions").insert(_food_session_row(session_id, timestamp)).execute()
+        
         # Prepare rows for database - each food item gets its own row
-        rows = []
-        for item in food_items:
-            macros = item.get('macros', {})
-            row = {
-                "food_name": item.get("food"),
-                "quantity": item.get("quantity"),
-                "calories": macros.get("calories"),
-                "protein": macros.get("protein_g"),
-                "carbs": macros.get("carbs_g"),
-                "fat": macros.get("fat_g"),
-                "session_id": session_id,
-                "created_at": timestamp.isoformat()
-            }
-            rows.append(row)
-        
-        # Insert all rows at once
-        result = supabase.table("food_entries").insert(rows).execute()
+        rows = _food_entry_rows(food_items, session_id, timestamp)
+        
+        # Insert all rows at once, removing the session again if its entries fail to store
+        try:
+            result = supabase.table("food_entries").insert(rows).execute()
+        except Exception:
+            supabase.table("food_sessions").delete().eq("id", session_id).execute()
+            raise
         
         print(f"Stored food entry with {len(food_items)} items to Supabase (session: {session_id})")
         return True
@@ -97,94 +303,139 @@ def store_food_data(food_items: list, timestamp: datetime = None) -> bool:
         print(f"Error storing to Supabase: {e}")
         raise
 
+def store_food_data_copy(session_rows: list, rows: list) -> int:
+    """
+    Load food_sessions and food_entries rows straight into Postgres with COPY, skipping PostgREST
+    
+    Meant for migration-sized ingests only; user-facing writes stay on the
+    Supabase client. Requires psycopg and SUPABASE_DB_URL.
+    
+    Args:
+        session_rows: food_sessions rows as built by _food_session_row
+        rows: food_entries rows as built by _food_entry_rows
+        
+    Returns:
+        Number of rows copied
+    """
+    import psycopg
+    
+    db_url = os.getenv("SUPABASE_DB_URL")
+    if not db_url:
+        raise ValueError("SUPABASE_DB_URL must be set for COPY ingest")
+    
+    # SUPABASE_DB_URL should point at the Supavisor transaction pooler (port 6543),
+    # which cannot hold server-side prepared statements across transactions
+    with psycopg.connect(db_url, prepare_threshold=None, application_name=DB_APPLICATION_NAME) as conn:
+        with conn.cursor() as cur:
+            with cur.copy(
+                f"COPY food_sessions ({', '.join(FOOD_SESSION_COPY_COLUMNS)}) FROM STDIN"
+            ) as copy:
+                for row in session_rows:
+                    copy.write_row([row[column] for column in FOOD_SESSION_COPY_COLUMNS])
+            with cur.copy(
+                f"COPY food_entries ({', '.join(FOOD_ENTRY_COPY_COLUMNS)}) FROM STDIN"
+            ) as copy:
+                for row in rows:
+                    copy.write_row([row[column] for column in FOOD_ENTRY_COPY_COLUMNS])
+    
+    return len(rows)
+
+def store_food_data_bulk(sessions: list) -> int:
+    """
+    Store many food logging sessions with one insert per BULK_INSERT_CHUNK_SIZE rows
+    
+    Args:
+        sessions: List of (food_items, timestamp) tuples, one per recording
+        
+    Returns:
+        Number of rows stored
+        
+    Raises:
+        Exception: If storage fails
+    """
+    session_rows = []
+    rows = []
+    dates = set()
+    for food_items, timestamp in sessions:
+        if not food_items:
+            continue
+        if timestamp is None:
+            timestamp = datetime.now()
+        session_id = str(uuid.uuid4())
+        session_rows.append(_food_session_row(session_id, timestamp))
+        rows.extend(_food_entry_rows(food_items, session_id, timestamp))
+        dates.add(timestamp.date().isoformat())
+    
+    if not rows:
+        return 0
+    
+    try:
+        if os.getenv("BULK_INGEST") == "1":
+            store_food_data_copy(session_rows, rows)
+        else:
+            supabase = _get_supabase_client()
+            inserted_session_ids = []
+            try:
+                for start in range(0, len(session_rows), BULK_INSERT_CHUNK_SIZE):
+                    chunk = session_rows[start:start + BULK_INSERT_CHUNK_SIZE]
+                    supabase.table("food_sessions").insert(chunk).execute()
+                    inserted_session_ids.extend(row["id"] for row in chunk)
+                for start in range(0, len(rows), BULK_INSERT_CHUNK_SIZE):
+                    supabase.table("food_entries").insert(rows[start:start + BULK_INSERT_CHUNK_SIZE]).execute()
+            except Exception:
+                # Deleting the stored sessions cascades to any entry chunks already inserted
+                for start in range(0, len(inserted_session_ids), BULK_INSERT_CHUNK_SIZE):
+                    supabase.table("food_sessions") \
+                        .delete() \
+                        .in_("id", inserted_session_ids[start:start + BULK_INSERT_CHUNK_SIZE]) \
+                        .execute()
+                raise
+        
+        print(f"Stored {len(rows)} food items from {len(dates)} days to Supabase")
+        return len(rows)
+        
+    except Exception as e:
+        print(f"Error bulk storing to Supabase: {e}")
+        raise
+
 def get_today_entries() -> list:
     """Get all food entries for today, grouped by session"""
     try:
         supabase = _get_supabase_client()
-        today = datetime.now().date()
+        return [_session_from_row(row) for row in _iter_sessions_by_date(supabase, datetime.now().date())]
         
-        # Query today's entries
-        result = supabase.table("food_entries") \
-            .select("*") \
-            .gte("created_at", f"{today}T00:00:00") \
-            .lte("created_at", f"{today}T23:59:59") \
-            .order("created_at", desc=False) \
-            .execute()
-        
-        # Group by session_id to maintain UI compatibility
-        sessions = {}
-        for row in result.data:
-            session_id = row.get("session_id")
-            
-            # Handle entries without session_id (fallback to individual entries)
-            if not session_id:
-                session_id = str(row["id"])
-            
-            if session_id not in sessions:
-                sessions[session_id] = {
-                    "id": session_id,
-                    "timestamp": row["created_at"],
-                    "meal_type": detect_meal_time(datetime.fromisoformat(row["created_at"].replace('Z', '+00:00'))),
-                    "meal_emoji": "",  # Will be set below
-                    "items": []
-                }
-            
-            # Add item to session
-            sessions[session_id]["items"].append({
-                "food": row["food_name"],
-                "quantity": row["quantity"],
-                "macros": {
-                    "calories": row["calories"] or 0,
-                    "protein_g": row["protein"] or 0,
-                    "carbs_g": row["carbs"] or 0,
-                    "fat_g": row["fat"] or 0
-                }
-            })
-        
-        # Set meal emoji for each session
-        for session in sessions.values():
-            session["meal_emoji"] = get_meal_emoji(session["meal_type"])
-        
-        # Return as list for UI compatibility
-        return list(sessions.values())
+    except Exception as e:
+        print(f"Error retrieving today's entries: {e}")
+        return []
+
+async def aget_today_entries(supabase=None) -> list:
+    """Async variant of get_today_entries, optionally on a shared async client"""
+    try:
+        supabase = await _get_async_supabase_client(supabase)
+        return [_session_from_row(row) async for row in _aiter_sessions_by_date(supabase, datetime.now().date())]
         
     except Exception as e:
         print(f"Error retrieving today's entries: {e}")
         return []
 
+def get_today_summary() -> dict:
+    """Get today's entries and their macro totals from a single query"""
+    entries = get_today_entries()
+    return {
+        "entries": entries,
+        "totals": _calculate_daily_totals(entries)
+    }
+
 def get_daily_totals() -> dict:
     """Get daily macro totals for today"""
+    return get_daily_totals_by_date(datetime.now().date().isoformat())
+
+async def aget_daily_totals(supabase=None) -> dict:
+    """Async variant of get_daily_totals, optionally on a shared async client"""
     try:
-        supabase = _get_supabase_client()
-        today = datetime.now().date()
-        
-        # Query today's entries and calculate totals
-        result = supabase.table("food_entries") \
-            .select("calories, protein, carbs, fat") \
-            .gte("created_at", f"{today}T00:00:00") \
-            .lte("created_at", f"{today}T23:59:59") \
-            .execute()
-        
-        totals = {
-            "calories": 0,
-            "protein_g": 0,
-            "carbs_g": 0,
-            "fat_g": 0
-        }
-        
-        for row in result.data:
-            totals["calories"] += row.get("calories") or 0
-            totals["protein_g"] += row.get("protein") or 0
-            totals["carbs_g"] += row.get("carbs") or 0
-            totals["fat_g"] += row.get("fat") or 0
-        
-        # Round the totals
-        return {
-            "calories": round(totals["calories"]),
-            "protein_g": round(totals["protein_g"], 1),
-            "carbs_g": round(totals["carbs_g"], 1),
-            "fat_g": round(totals["fat_g"], 1)
-        }
+        supabase = await _get_async_supabase_client(supabase)
+        result = await _daily_totals_query(supabase, datetime.now().date().isoformat()).execute()
+        return _totals_from_daily_row(result.data)
         
     except Exception as e:
         print(f"Error calculating daily totals: {e}")
@@ -194,40 +445,7 @@ def get_entries_by_date(date: str) -> list:
     """Get food entries for a specific date (YYYY-MM-DD format)"""
     try:
         supabase = _get_supabase_client()
-        
-        # Query entries for specific date
-        result = supabase.table("food_entries") \
-            .select("*") \
-            .gte("created_at", f"{date}T00:00:00") \
-            .lte("created_at", f"{date}T23:59:59") \
-            .order("created_at", desc=False) \
-            .execute()
-        
-        # Group by session_id
-        sessions = {}
-        for row in result.data:
-            session_id = row.get("session_id", str(row["id"]))
-            
-            if session_id not in sessions:
-                sessions[session_id] = {
-                    "id": session_id,
-                    "timestamp": row["created_at"],
-                    "meal_type": detect_meal_time(datetime.fromisoformat(row["created_at"].replace('Z', '+00:00'))),
-                    "items": []
-                }
-            
-            sessions[session_id]["items"].append({
-                "food": row["food_name"],
-                "quantity": row["quantity"],
-                "macros": {
-                    "calories": row["calories"] or 0,
-                    "protein_g": row["protein"] or 0,
-                    "carbs_g": row["carbs"] or 0,
-                    "fat_g": row["fat"] or 0
-                }
-            })
-        
-        return list(sessions.values())
+        return [_session_from_row(row) for row in _iter_sessions_by_date(supabase, date)]
         
     except Exception as e:
         print(f"Error retrieving entries for {date}: {e}")
@@ -237,38 +455,17 @@ def get_daily_totals_by_date(date: str) -> dict:
     """Get daily macro totals for a specific date (YYYY-MM-DD format)"""
     try:
         supabase = _get_supabase_client()
-        
-        # Query entries for specific date and calculate totals
-        result = supabase.table("food_entries") \
-            .select("calories, protein, carbs, fat") \
-            .gte("created_at", f"{date}T00:00:00") \
-            .lte("created_at", f"{date}T23:59:59") \
-            .execute()
-        
-        totals = {
-            "calories": 0,
-            "protein_g": 0,
-            "carbs_g": 0,
-            "fat_g": 0
-        }
-        
-        for row in result.data:
-            totals["calories"] += row.get("calories") or 0
-            totals["protein_g"] += row.get("protein") or 0
-            totals["carbs_g"] += row.get("carbs") or 0
-            totals["fat_g"] += row.get("fat") or 0
-        
-        return {
-            "calories": round(totals["calories"]),
-            "protein_g": round(totals["protein_g"], 1),
-            "carbs_g": round(totals["carbs_g"], 1),
-            "fat_g": round(totals["fat_g"], 1)
-        }
+        result = _daily_totals_query(supabase, date).execute()
+        return _totals_from_daily_row(result.data)
         
     except Exception as e:
         print(f"Error calculating daily totals for {date}: {e}")
         return {"calories": 0, "protein_g": 0, "carbs_g": 0, "fat_g": 0}
 
+def get_daily_totals_for_dates(dates: list) -> list:
+    """Get daily macro totals for several dates (YYYY-MM-DD), querying them concurrently"""
+    return list(_POOL.map(get_daily_totals_by_date, dates))
+
 def delete_entry(entry_id: str) -> bool:
     """
     Delete a food entry by its session ID or individual ID
@@ -282,24 +479,10 @@ def delete_entry(entry_id: str) -> bool:
     try:
         supabase = _get_supabase_client()
         
-        # First try to delete by session_id (for grouped entries)
-        result = supabase.table("food_entries") \
-            .delete() \
-            .eq("session_id", entry_id) \
-            .execute()
+        result = _delete_entry_query(supabase, entry_id).execute()
         
         if result.data:
-            print(f"Deleted session with ID {entry_id}")
-            return True
-        
-        # If no session found, try individual entry ID
-        result = supabase.table("food_entries") \
-            .delete() \
-            .eq("id", entry_id) \
-            .execute()
-        
-        if result.data:
-            print(f"Deleted individual entry with ID {entry_id}")
+            print(f"Deleted entry with ID {entry_id} ({len(result.data)} rows)")
             return True
         
         return False
@@ -375,14 +558,18 @@ def get_weight_entries(start_date: str, end_date: str) -> list:
     """Get weight entries within a date range"""
     try:
         supabase = _get_supabase_client()
+        result = _weight_entries_query(supabase, start_date, end_date).execute()
+        return result.data
         
-        result = supabase.table("weight_entries") \
-            .select("*") \
-            .gte("created_at", f"{start_date}T00:00:00") \
-            .lte("created_at", f"{end_date}T23:59:59") \
-            .order("created_at", desc=False) \
-            .execute()
-        
+    except Exception as e:
+        print(f"Error retrieving weight entries: {e}")
+        return []
+
+async def aget_weight_entries(start_date: str, end_date: str, supabase=None) -> list:
+    """Async variant of get_weight_entries, optionally on a shared async client"""
+    try:
+        supabase = await _get_async_supabase_client(supabase)
+        result = await _weight_entries_query(supabase, start_date, end_date).execute()
         return result.data
         
     except Exception as e:
@@ -392,62 +579,66 @@ def get_weight_entries(start_date: str, end_date: str) -> list:
 def get_weight_history_by_period(period: str) -> list:
     """Get weight data for charts by time period"""
     try:
-        from datetime import timedelta
-        
-        now = datetime.now()
-        
-        if period == "today":
-            start_date = now.date().isoformat()
-            end_date = now.date().isoformat()
-        elif period == "week":
-            start_date = (now - timedelta(days=7)).date().isoformat()
-            end_date = now.date().isoformat()
-        elif period == "month":
-            start_date = (now - timedelta(days=30)).date().isoformat()
-            end_date = now.date().isoformat()
-        else:
-            start_date = (now - timedelta(days=7)).date().isoformat()
-            end_date = now.date().isoformat()
-        
+        start_date, end_date = _weight_period_range(period)
         return get_weight_entries(start_date, end_date)
         
     except Exception as e:
         print(f"Error retrieving weight history for period {period}: {e}")
         return []
 
+async def aget_weight_history_by_period(period: str, supabase=None) -> list:
+    """Async variant of get_weight_history_by_period, optionally on a shared async client"""
+    try:
+        start_date, end_date = _weight_period_range(period)
+        return await aget_weight_entries(start_date, end_date, supabase)
+        
+    except Exception as e:
+        print(f"Error retrieving weight history for period {period}: {e}")
+        return []
+
 def get_user_goals() -> dict:
     """Get current user goals"""
+    cached = _cached_user_goals()
+    if cached is not None:
+        return cached
+    
     try:
         supabase = _get_supabase_client()
+        result = _user_goals_query(supabase).execute()
         
-        result = supabase.table("user_goals") \
-            .select("*") \
-            .order("created_at", desc=True) \
-            .limit(1) \
-            .execute()
+        # Return default goals if none exist
+        goals = result.data[0] if result.data else _default_user_goals()
+        _cache_user_goals(goals)
+        return goals
+            
+    except Exception as e:
+        print(f"Error retrieving user goals: {e}")
+        return _default_user_goals()
+
+async def aget_user_goals(supabase=None) -> dict:
+    """Async variant of get_user_goals, optionally on a shared async client"""
+    cached = _cached_user_goals()
+    if cached is not None:
+        return cached
+    
+    try:
+        supabase = await _get_async_supabase_client(supabase)
+        result = await _user_goals_query(supabase).execute()
         
-        if result.data:
-            return result.data[0]
-        else:
-            # Return default goals if none exist
-            return {
-                "calorie_goal": 1800,
-                "protein_goal": 160.0,
-                "weight_goal_kg": 70.0
-            }
+        # Return default goals if none exist
+        goals = result.data[0] if result.data else _default_user_goals()
+        _cache_user_goals(goals)
+        return goals
             
     except Exception as e:
         print(f"Error retrieving user goals: {e}")
-        return {"calorie_goal": 1800, "protein_goal": 160.0, "weight_goal_kg": 70.0}
+        return _default_user_goals()
 
 def update_user_goals(goals: dict) -> bool:
     """Update user goals"""
     try:
         supabase = _get_supabase_client()
         
-        # Check if goals already exist
-        existing = supabase.table("user_goals").select("id").limit(1).execute()
-        
         goals_data = {
             "calorie_goal": goals.get("calorie_goal", 1800),
             "protein_goal": goals.get("protein_goal", 160.0),
@@ -455,15 +646,12 @@ def update_user_goals(goals: dict) -> bool:
             "updated_at": datetime.now().isoformat()
         }
         
-        if existing.data:
-            # Update existing goals
-            goal_id = existing.data[0]['id']
-            result = supabase.table("user_goals").update(goals_data).eq("id", goal_id).execute()
-        else:
-            # Insert new goals
-            goals_data["created_at"] = datetime.now().isoformat()
-            result = supabase.table("user_goals").insert(goals_data).execute()
+        # user_goals holds a single row, so insert-or-update is one upsert on its singleton key
+        supabase.table("user_goals") \
+            .upsert({**goals_data, "singleton_key": True}, on_conflict="singleton_key") \
+            .execute()
         
+        _invalidate_user_goals()
         print(f"Updated user goals: {goals_data}")
         return True
         
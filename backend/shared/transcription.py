@@ -1,9 +1,33 @@
 import os
+import threading
 from groq import Groq
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Groq Whisper supports various audio formats, not just WAV. Each maps to the
+# content type sent with its upload, so it doesn't depend on guessing from the filename
+_AUDIO_CONTENT_TYPES = {
+    '.wav': 'audio/wav',
+    '.webm': 'audio/webm',
+    '.mp3': 'audio/mpeg',
+    '.m4a': 'audio/mp4',
+    '.ogg': 'audio/ogg',
+}
+
+SUPPORTED_FORMATS = tuple(_AUDIO_CONTENT_TYPES)
+
+_groq_client = None
+_groq_client_lock = threading.Lock()
+
+def _get_groq_client():
+    """Get the shared Groq client so its pooled connections are reused across transcriptions"""
+    global _groq_client
+    with _groq_client_lock:
+        if _groq_client is None:
+            _groq_client = Groq()
+    return _groq_client
+
 def transcribe_file(audio_file_path: str) -> str:
     """
     Transcribe an audio file using Groq Whisper API
@@ -20,16 +44,15 @@ def transcribe_file(audio_file_path: str) -> str:
     if not os.path.exists(audio_file_path):
         raise FileNotFoundError(f"Audio file not found: {audio_file_path}")
     
-    # Groq Whisper supports various audio formats, not just WAV
-    supported_formats = ['.wav', '.webm', '.mp3', '.m4a', '.ogg']
-    if not any(audio_file_path.lower().endswith(fmt) for fmt in supported_formats):
-        raise ValueError(f"Audio format not supported. Supported formats: {', '.join(supported_formats)}")
+    extension = os.path.splitext(audio_file_path)[1].lower()
+    if extension not in _AUDIO_CONTENT_TYPES:
+        raise ValueError(f"Audio format not supported. Supported formats: {', '.join(SUPPORTED_FORMATS)}")
     
-    client = Groq()
+    client = _get_groq_client()
     
     with open(audio_file_path, "rb") as file:
         transcription = client.audio.transcriptions.create(
-            file=(os.path.basename(audio_file_path), file.read()),
+            file=(os.path.basename(audio_file_path), file, _AUDIO_CONTENT_TYPES[extension]),
             model="whisper-large-v3-turbo",
             response_format="text",
         )
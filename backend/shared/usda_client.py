@@ -4,14 +4,27 @@ Provides access to USDA's comprehensive food nutrition database
 """
 
 import os
+import sqlite3
+import threading
+import time
 import requests
 import json
 import re
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
+from cachetools import LRUCache, TTLCache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Search results persist across restarts in this SQLite file when set (on Vercel only /tmp is writable)
+USDA_CACHE_PATH = os.getenv("USDA_CACHE_PATH")
+USDA_CACHE_TTL_SECONDS = 7 * 86400
+
+# Words that indicate processed/prepared foods (lower priority), matched in one pass
+_PROCESSED_WORDS = re.compile(r'\b(?:breaded|fried|cooked|prepared|seasoned|marinated|stuffed)\b', re.IGNORECASE)
+
 class USDAClient:
     """Client for USDA FoodData Central API"""
     
@@ -23,12 +36,95 @@ class USDAClient:
         "205": "carbs_g",       # Carbohydrate, by difference (g)
     }
     
+    # Messages for API error statuses that need no response details
+    API_ERROR_MESSAGES = {
+        403: "USDA API: Invalid API key or access denied",
+        429: "USDA API: Rate limit exceeded (1000 requests/hour)",
+    }
+    
     def __init__(self, api_key: Optional[str] = None):
         """Initialize USDA client with API key"""
         self.api_key = api_key or os.getenv("USDA_API_KEY", "DEMO_KEY")
         self.base_url = "https://api.nal.usda.gov/fdc/v1"
         self.timeout = 10  # seconds
         
+        # Keep connections to the USDA API alive across lookups
+        self._session = requests.Session()
+        self._session.headers.update({"Accept": "application/json"})
+        self._session.mount("https://", HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=10,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+        ))
+        
+        # The same foods are looked up across many sessions. Search results are cached per
+        # query and each food's per-100g nutrition for a day, so any quantity of a known
+        # food is scaled locally without an API call.
+        self._cache_lock = threading.Lock()
+        self._search_cache = LRUCache(maxsize=512)
+        self._base_nutrition_cache = TTLCache(maxsize=1024, ttl=86400)
+        self._disk_cache = None
+    
+    def __enter__(self):
+        """Use the client as a context manager that closes its connections on exit"""
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Close pooled connections when leaving the with block"""
+        self.close()
+    
+    def close(self) -> None:
+        """Close pooled HTTP connections and the disk cache"""
+        self._session.close()
+        with self._cache_lock:
+            if self._disk_cache is not None:
+                self._disk_cache.close()
+                self._disk_cache = None
+    
+    def _open_disk_cache(self) -> sqlite3.Connection:
+        """Open the SQLite search cache on first use (caller holds _cache_lock)"""
+        if self._disk_cache is None:
+            connection = sqlite3.connect(USDA_CACHE_PATH, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS usda_searches ("
+                "query TEXT, data_type TEXT, page_size INTEGER, "
+                "response_json TEXT, fetched_at INTEGER, "
+                "PRIMARY KEY (query, data_type, page_size))"
+            )
+            self._disk_cache = connection
+        return self._disk_cache
+    
+    def _disk_cache_get(self, cache_key: tuple) -> Optional[List[Dict]]:
+        """Get unexpired search results from the SQLite cache, or None on a miss"""
+        if not USDA_CACHE_PATH:
+            return None
+        try:
+            with self._cache_lock:
+                row = self._open_disk_cache().execute(
+                    "SELECT response_json FROM usda_searches "
+                    "WHERE query = ? AND data_type = ? AND page_size = ? AND fetched_at > ?",
+                    (*cache_key, int(time.time()) - USDA_CACHE_TTL_SECONDS)
+                ).fetchone()
+            return json.loads(row[0]) if row else None
+        except Exception as e:
+            print(f"USDA disk cache read failed: {e}")
+            return None
+    
+    def _disk_cache_put(self, cache_key: tuple, foods: List[Dict]) -> None:
+        """Store search results in the SQLite cache"""
+        if not USDA_CACHE_PATH:
+            return
+        try:
+            with self._cache_lock:
+                with self._open_disk_cache() as connection:
+                    connection.execute(
+                        "INSERT OR REPLACE INTO usda_searches VALUES (?, ?, ?, ?, ?)",
+                        (*cache_key, json.dumps(foods), int(time.time()))
+                    )
+        except Exception as e:
+            print(f"USDA disk cache write failed: {e}")
+        
     def search_food(self, query: str, data_type: str = "SR Legacy", page_size: int = 10) -> List[Dict]:
         """
         Search USDA food database
@@ -41,6 +137,18 @@ class USDAClient:
         Returns:
             List of food items with nutrition data
         """
+        cache_key = (query, data_type, page_size)
+        with self._cache_lock:
+            cached = self._search_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+        
+        cached = self._disk_cache_get(cache_key)
+        if cached is not None:
+            with self._cache_lock:
+                self._search_cache[cache_key] = cached
+            return list(cached)
+        
         try:
             url = f"{self.base_url}/foods/search"
             params = {
@@ -51,7 +159,7 @@ class USDAClient:
                 "sortBy": "score",  # Most relevant first
             }
             
-            response = requests.get(url, params=params, timeout=self.timeout)
+            response = self._session.get(url, params=params, timeout=self.timeout)
             response.raise_for_status()
             
             data = response.json()
@@ -61,7 +169,10 @@ class USDAClient:
             if foods:
                 foods = self._filter_best_matches(foods, query)
             
-            return foods
+            with self._cache_lock:
+                self._search_cache[cache_key] = foods
+            self._disk_cache_put(cache_key, foods)
+            return list(foods)
             
         except Exception as e:
             print(f"USDA search failed for '{query}': {e}")
@@ -72,18 +183,12 @@ class USDAClient:
         Filter and reorder foods to get best matches first
         Prefer raw/basic foods over processed ones
         """
-        # Words that indicate processed/prepared foods (lower priority)
-        processed_words = ['breaded', 'fried', 'cooked', 'prepared', 'seasoned', 'marinated', 'stuffed']
-        
         # Split foods into raw/basic vs processed
         raw_foods = []
         processed_foods = []
         
         for food in foods:
-            description = food.get('description', '').lower()
-            is_processed = any(word in description for word in processed_words)
-            
-            if is_processed:
+            if _PROCESSED_WORDS.search(food.get('description', '')):
                 processed_foods.append(food)
             else:
                 raw_foods.append(food)
@@ -147,31 +252,49 @@ class USDAClient:
             Dictionary with nutrition information
         """
         try:
-            # Try multiple search strategies for better results
-            search_terms = self._generate_search_terms(food_name)
-            best_match = None
-            
-            for search_term in search_terms:
-                search_results = self.search_food(search_term)
-                if search_results:
-                    # Filter results to only those containing the original food name
-                    filtered_results = self._filter_by_food_name(search_results, food_name)
-                    if filtered_results:
-                        best_match = filtered_results[0]
-                        break
-            
-            if not best_match:
-                print(f"No suitable USDA results found for '{food_name}', falling back to local")
-                return self._fallback_to_local(food_name, quantity_g)
-            
-            # Extract and scale nutrition
-            nutrition = self._extract_nutrition(best_match, quantity_g)
-            print(f"Selected: {best_match['description']} ({nutrition['calories']} cal per {quantity_g}g)")
-            return nutrition
-            
+            base = self._get_base_per_100g(food_name)
         except Exception as e:
             print(f"USDA nutrition lookup failed for '{food_name}': {e}")
             return self._fallback_to_local(food_name, quantity_g)
+        
+        if base is None:
+            print(f"No suitable USDA results found for '{food_name}', falling back to local")
+            return self._fallback_to_local(food_name, quantity_g)
+        
+        # Only the scaling depends on the quantity
+        description, base_nutrition = base
+        nutrition = self._usda_nutrition(base_nutrition, quantity_g)
+        print(f"Selected: {description} ({nutrition['calories']} cal per {quantity_g}g)")
+        return nutrition
+    
+    def _get_base_per_100g(self, food_name: str) -> Optional[Tuple[str, Dict]]:
+        """Find the best USDA match for a food and its per-100g nutrition, cached per food name"""
+        cache_key = food_name.lower().strip()
+        with self._cache_lock:
+            cached = self._base_nutrition_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        # Try multiple search strategies for better results
+        search_terms = self._generate_search_terms(food_name)
+        best_match = None
+        
+        for search_term in search_terms:
+            search_results = self.search_food(search_term)
+            if search_results:
+                # Filter results to only those containing the original food name
+                filtered_results = self._filter_by_food_name(search_results, food_name)
+                if filtered_results:
+                    best_match = filtered_results[0]
+                    break
+        
+        if not best_match:
+            return None
+        
+        base = (best_match['description'], self._extract_base_nutrition(best_match))
+        with self._cache_lock:
+            self._base_nutrition_cache[cache_key] = base
+        return base
     
     def _generate_search_terms(self, food_name: str) -> List[str]:
         """Generate multiple search terms for better food matching"""
@@ -203,6 +326,18 @@ class USDAClient:
         Returns:
             Nutrition dictionary scaled to quantity
         """
+        return self._usda_nutrition(self._extract_base_nutrition(food_data), quantity_g)
+    
+    def _extract_base_nutrition(self, food_data: Dict) -> Dict:
+        """
+        Extract key nutrition values per 100g from USDA food data
+        
+        Args:
+            food_data: USDA API food item response
+            
+        Returns:
+            Nutrition dictionary per 100g
+        """
         # Initialize nutrition with defaults
         base_nutrition = {
             "calories": 0,
@@ -213,20 +348,31 @@ class USDAClient:
         
         # Extract nutrients from USDA data (values are per 100g)
         food_nutrients = food_data.get("foodNutrients", [])
+        nutrient_mapping = self.NUTRIENT_MAPPING
+        remaining = len(nutrient_mapping)
         
         for nutrient in food_nutrients:
-            nutrient_number = nutrient.get("nutrientNumber")
-            if nutrient_number in self.NUTRIENT_MAPPING:
-                field_name = self.NUTRIENT_MAPPING[nutrient_number]
-                value = nutrient.get("value", 0)
-                
-                # Convert to appropriate type
-                if field_name == "calories":
-                    base_nutrition[field_name] = int(value) if value else 0
-                else:
-                    base_nutrition[field_name] = float(value) if value else 0.0
+            field_name = nutrient_mapping.get(nutrient.get("nutrientNumber"))
+            if field_name is None:
+                continue
+            
+            value = nutrient.get("value", 0)
+            
+            # Convert to appropriate type
+            if field_name == "calories":
+                base_nutrition[field_name] = int(value) if value else 0
+            else:
+                base_nutrition[field_name] = float(value) if value else 0.0
+            
+            # Foods list dozens of nutrients; stop once all tracked ones are found
+            remaining -= 1
+            if not remaining:
+                break
         
-        # Scale nutrition to requested quantity (USDA values are per 100g)
+        return base_nutrition
+    
+    def _usda_nutrition(self, base_nutrition: Dict, quantity_g: float) -> Dict:
+        """Scale per-100g USDA nutrition to a quantity and tag its source"""
         scaled_nutrition = self._scale_nutrition(base_nutrition, quantity_g)
         scaled_nutrition["source"] = "usda"
         
@@ -290,14 +436,33 @@ class USDAClient:
     
     def _handle_api_error(self, response: requests.Response) -> None:
         """Handle API error responses"""
-        if response.status_code == 403:
-            print("USDA API: Invalid API key or access denied")
-        elif response.status_code == 429:
-            print("USDA API: Rate limit exceeded (1000 requests/hour)")
-        elif response.status_code >= 500:
-            print("USDA API: Server error")
-        else:
-            print(f"USDA API error: {response.status_code} - {response.text}")
+        message = self.API_ERROR_MESSAGES.get(response.status_code)
+        if message is None:
+            if response.status_code >= 500:
+                message = "USDA API: Server error"
+            else:
+                message = f"USDA API error: {response.status_code} - {response.text}"
+        print(message)
+
+# Grams per unit; plurals and longer forms are folded to these keys
+_UNIT_GRAMS = {
+    'kg': 1000.0,
+    'g': 1.0,
+    'cup': 150.0,           # Rough approximation: 1 cup ≈ 150g
+    'tablespoon': 15.0,     # 1 tbsp ≈ 15g
+    'tbsp': 15.0,
+    'teaspoon': 5.0,        # 1 tsp ≈ 5g
+    'tsp': 5.0,
+    'oz': 28.35,            # 1 oz ≈ 28.35g
+    'lb': 453.6,            # 1 lb ≈ 453.6g
+    'pound': 453.6,
+}
+
+# First number (or simple fraction like "1/2") in a quantity string and the unit directly after it, if any
+_QUANTITY = re.compile(r'(\d+\.?\d*)(?:\s*/\s*(\d+\.?\d*))?\s*(?:(kg|g|cups?|tbsp|tablespoons?|tsp|teaspoons?|oz|lbs?|pounds?)\b)?')
+
+# A unit word later in the string, e.g. "1 heaped cupful" or "2 level tablespoons of sugar"
+_LATER_UNIT = re.compile(r'\b(kg|cup|tablespoon|tbsp|teaspoon|tsp|oz|lb|pound)')
 
 # Utility function to convert various quantity formats to grams
 def parse_quantity_to_grams(quantity_str: str) -> float:
@@ -312,31 +477,26 @@ def parse_quantity_to_grams(quantity_str: str) -> float:
     """
     quantity_str = quantity_str.lower().strip()
     
-    # Extract numeric value
-    numbers = re.findall(r'\d+\.?\d*', quantity_str)
-    if not numbers:
+    # Extract numeric value and the unit that follows it
+    match = _QUANTITY.search(quantity_str)
+    if not match:
         return 100.0  # Default to 100g
     
-    value = float(numbers[0])
+    numerator, denominator, unit = match.groups()
+    value = float(numerator)
+    if denominator and float(denominator):
+        value /= float(denominator)
+    
+    if unit is None:
+        # No unit right after the number: look for one further along
+        later = _LATER_UNIT.search(quantity_str, match.end())
+        if later is None:
+            return value  # No recognised unit: assume grams
+        unit = later.group(1)
     
-    # Handle different units
-    if 'g' in quantity_str and 'kg' not in quantity_str:
-        return value  # Already in grams
-    elif 'kg' in quantity_str:
-        return value * 1000  # Convert kg to grams
-    elif 'cup' in quantity_str:
-        return value * 150  # Rough approximation: 1 cup ≈ 150g
-    elif 'tablespoon' in quantity_str or 'tbsp' in quantity_str:
-        return value * 15   # 1 tbsp ≈ 15g
-    elif 'teaspoon' in quantity_str or 'tsp' in quantity_str:
-        return value * 5    # 1 tsp ≈ 5g
-    elif 'oz' in quantity_str:
-        return value * 28.35  # 1 oz ≈ 28.35g
-    elif 'lb' in quantity_str or 'pound' in quantity_str:
-        return value * 453.6  # 1 lb ≈ 453.6g
-    else:
-        # Default: assume grams
-        return value
+    if unit not in _UNIT_GRAMS:
+        unit = unit[:-1]  # Plural: 'cups' -> 'cup'
+    return value * _UNIT_GRAMS[unit]
 
 if __name__ == "__main__":
     # Simple test
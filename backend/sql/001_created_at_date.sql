@@ -0,0 +1,18 @@
+-- ABOUTME: Adds an indexed calendar-day column to food_entries and weight_entries
+-- ABOUTME: Lets per-day reads filter with a single equality/range on a date instead of timestamp bounds
+
+-- food_entries.created_at is timestamptz; days are bucketed in UTC
+ALTER TABLE food_entries
+    ADD COLUMN IF NOT EXISTS created_at_date date
+    GENERATED ALWAYS AS ((created_at AT TIME ZONE 'UTC')::date) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_food_entries_created_at_date
+    ON food_entries (created_at_date);
+
+-- weight_entries.created_at is a plain timestamp
+ALTER TABLE weight_entries
+    ADD COLUMN IF NOT EXISTS created_at_date date
+    GENERATED ALWAYS AS (created_at::date) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_weight_entries_created_at_date
+    ON weight_entries (created_at_date);
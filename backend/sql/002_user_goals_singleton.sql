@@ -0,0 +1,11 @@
+-- ABOUTME: Makes user_goals a single-row table addressable by a unique singleton_key
+-- ABOUTME: Lets update_user_goals write with one upsert instead of select-then-insert/update
+
+-- Keep only the goals row the app currently reads (most recently created)
+DELETE FROM user_goals
+WHERE id NOT IN (
+    SELECT id FROM user_goals ORDER BY created_at DESC LIMIT 1
+);
+
+ALTER TABLE user_goals
+    ADD COLUMN IF NOT EXISTS singleton_key boolean NOT NULL DEFAULT true UNIQUE;
@@ -0,0 +1,17 @@
+-- ABOUTME: Backfills NULL macros in food_entries with 0 and forbids NULLs going forward
+-- ABOUTME: Lets read paths use macro columns as-is instead of null-coalescing every row
+
+UPDATE food_entries SET calories = 0 WHERE calories IS NULL;
+UPDATE food_entries SET protein = 0 WHERE protein IS NULL;
+UPDATE food_entries SET carbs = 0 WHERE carbs IS NULL;
+UPDATE food_entries SET fat = 0 WHERE fat IS NULL;
+
+ALTER TABLE food_entries
+    ALTER COLUMN calories SET DEFAULT 0,
+    ALTER COLUMN calories SET NOT NULL,
+    ALTER COLUMN protein SET DEFAULT 0,
+    ALTER COLUMN protein SET NOT NULL,
+    ALTER COLUMN carbs SET DEFAULT 0,
+    ALTER COLUMN carbs SET NOT NULL,
+    ALTER COLUMN fat SET DEFAULT 0,
+    ALTER COLUMN fat SET NOT NULL;
@@ -0,0 +1,58 @@
+-- ABOUTME: Per-day macro totals table kept in step with food_entries by a row-level trigger
+-- ABOUTME: Daily totals become a primary-key lookup; each write adjusts one summary row
+
+CREATE TABLE IF NOT EXISTS food_entries_daily (
+    day date PRIMARY KEY,
+    calories numeric NOT NULL DEFAULT 0,
+    protein numeric NOT NULL DEFAULT 0,
+    carbs numeric NOT NULL DEFAULT 0,
+    fat numeric NOT NULL DEFAULT 0
+);
+
+-- Adds (sign = 1) or removes (sign = -1) one entry's macros from its day
+CREATE OR REPLACE FUNCTION food_entries_daily_apply(entry food_entries, sign integer)
+RETURNS void
+LANGUAGE sql AS $$
+    INSERT INTO food_entries_daily AS d (day, calories, protein, carbs, fat)
+    VALUES (entry.created_at_date,
+            sign * entry.calories,
+            sign * entry.protein,
+            sign * entry.carbs,
+            sign * entry.fat)
+    ON CONFLICT (day) DO UPDATE SET
+        calories = d.calories + EXCLUDED.calories,
+        protein = d.protein + EXCLUDED.protein,
+        carbs = d.carbs + EXCLUDED.carbs,
+        fat = d.fat + EXCLUDED.fat;
+$$;
+
+-- SECURITY DEFINER so API-key writes to food_entries can update the summary row
+CREATE OR REPLACE FUNCTION food_entries_daily_sync()
+RETURNS trigger
+LANGUAGE plpgsql SECURITY DEFINER SET search_path = public AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM food_entries_daily_apply(OLD, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM food_entries_daily_apply(NEW, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS food_entries_daily_sync ON food_entries;
+CREATE TRIGGER food_entries_daily_sync
+    AFTER INSERT OR UPDATE OR DELETE ON food_entries
+    FOR EACH ROW EXECUTE FUNCTION food_entries_daily_sync();
+
+-- Seed from existing entries
+INSERT INTO food_entries_daily (day, calories, protein, carbs, fat)
+SELECT created_at_date, SUM(calories), SUM(protein), SUM(carbs), SUM(fat)
+FROM food_entries
+GROUP BY created_at_date
+ON CONFLICT (day) DO UPDATE SET
+    calories = EXCLUDED.calories,
+    protein = EXCLUDED.protein,
+    carbs = EXCLUDED.carbs,
+    fat = EXCLUDED.fat;
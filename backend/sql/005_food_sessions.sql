@@ -0,0 +1,50 @@
+-- ABOUTME: Adds a food_sessions parent table (one row per recording) referenced by food_entries
+-- ABOUTME: Reads embed each session's entries server-side instead of regrouping flat rows in Python
+
+CREATE TABLE IF NOT EXISTS food_sessions (
+    id uuid PRIMARY KEY,
+    created_at timestamptz NOT NULL,
+    created_at_date date GENERATED ALWAYS AS ((created_at AT TIME ZONE 'UTC')::date) STORED,
+    meal_type text NOT NULL,
+    meal_emoji text NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_food_sessions_created_at_date
+    ON food_sessions (created_at_date);
+
+-- Entries stored without a session become sessions of their own
+UPDATE food_entries SET session_id = gen_random_uuid() WHERE session_id IS NULL;
+
+ALTER TABLE food_entries
+    ALTER COLUMN session_id TYPE uuid USING session_id::uuid,
+    ALTER COLUMN session_id SET NOT NULL;
+
+-- Backfill one session per existing session_id, using the same hour ranges as meal_detection.py
+INSERT INTO food_sessions (id, created_at, meal_type, meal_emoji)
+SELECT session_id, created_at, meal_type,
+       CASE meal_type
+           WHEN 'breakfast' THEN '🌅'
+           WHEN 'lunch' THEN '☀️'
+           WHEN 'dinner' THEN '🌙'
+           ELSE '🍿'
+       END
+FROM (
+    SELECT session_id,
+           MIN(created_at) AS created_at,
+           CASE
+               WHEN EXTRACT(HOUR FROM MIN(created_at) AT TIME ZONE 'UTC') BETWEEN 5 AND 10 THEN 'breakfast'
+               WHEN EXTRACT(HOUR FROM MIN(created_at) AT TIME ZONE 'UTC') BETWEEN 11 AND 14 THEN 'lunch'
+               WHEN EXTRACT(HOUR FROM MIN(created_at) AT TIME ZONE 'UTC') BETWEEN 18 AND 21 THEN 'dinner'
+               ELSE 'snack'
+           END AS meal_type
+    FROM food_entries
+    GROUP BY session_id
+) AS sessions
+ON CONFLICT (id) DO NOTHING;
+
+ALTER TABLE food_entries
+    ADD CONSTRAINT food_entries_session_id_fkey
+    FOREIGN KEY (session_id) REFERENCES food_sessions (id) ON DELETE CASCADE;
+
+CREATE INDEX IF NOT EXISTS idx_food_entries_session_id
+    ON food_entries (session_id);
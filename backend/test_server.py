@@ -4,6 +4,7 @@
 # ABOUTME: Combines all API endpoints into one Flask app for testing
 
 from flask import Flask, request, jsonify
+import asyncio
 import os
 import sys
 from dotenv import load_dotenv
@@ -16,10 +17,20 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'shared'))
 
 # Import storage functions directly
 from supabase_storage import get_user_goals, update_user_goals, store_weight_entry, get_weight_entries, delete_weight_entry
+from supabase_storage import aget_daily_totals, aget_user_goals, _get_async_supabase_client
 from datetime import datetime, timedelta
 
 app = Flask(__name__)
 
+async def _fetch_today_totals_and_goals():
+    """Fetch today's totals and user goals concurrently over one async client"""
+    supabase = await _get_async_supabase_client()
+    try:
+        return await asyncio.gather(aget_daily_totals(supabase), aget_user_goals(supabase))
+    finally:
+        # Each request runs its own event loop, so close the client's connection pool before it ends
+        await supabase.postgrest.aclose()
+
 # Health check endpoint
 @app.route('/api/health', methods=['GET'])
 def health_check():
@@ -62,10 +73,11 @@ def weight_entries_get():
         start_date = request.args.get('start_date')
         end_date = request.args.get('end_date')
         
+        today = datetime.now().date()
         if not start_date:
-            start_date = (datetime.now() - timedelta(days=30)).date().isoformat()
+            start_date = (today - timedelta(days=30)).isoformat()
         if not end_date:
-            end_date = datetime.now().date().isoformat()
+            end_date = today.isoformat()
             
         entries = get_weight_entries(start_date, end_date)
         return jsonify({"success": True, "data": entries, "count": len(entries)})
@@ -111,10 +123,8 @@ def weight_history_get():
             return jsonify({"success": False, "error": "Invalid period"}), 400
             
         # Simple implementation for testing
-        entries = get_weight_entries(
-            (datetime.now() - timedelta(days=7)).date().isoformat(),
-            datetime.now().date().isoformat()
-        )
+        today = datetime.now().date()
+        entries = get_weight_entries((today - timedelta(days=7)).isoformat(), today.isoformat())
         
         goals = get_user_goals()
         history_data = []
@@ -132,10 +142,8 @@ def weight_history_get():
 @app.route('/api/weight-history/latest', methods=['GET'])
 def weight_history_latest():
     try:
-        entries = get_weight_entries(
-            (datetime.now() - timedelta(days=30)).date().isoformat(),
-            datetime.now().date().isoformat()
-        )
+        today = datetime.now().date()
+        entries = get_weight_entries((today - timedelta(days=30)).isoformat(), today.isoformat())
         
         if entries:
             latest = entries[-1]  # Last entry
@@ -156,11 +164,8 @@ def weight_history_latest():
 @app.route('/api/calorie-history/today', methods=['GET'])
 def calorie_history_today():
     try:
-        from supabase_storage import get_daily_totals
-        
         today = datetime.now().date().isoformat()
-        daily_totals = get_daily_totals()  # Today's totals
-        goals = get_user_goals()
+        daily_totals, goals = asyncio.run(_fetch_today_totals_and_goals())
         
         goal_calories = goals.get("calorie_goal", 1800)
         progress_percentage = (daily_totals["calories"] / goal_calories * 100) if goal_calories > 0 else 0
@@ -0,0 +1,71 @@
+# ABOUTME: Shared pytest configuration for the backend test suite
+# ABOUTME: Skips tests marked "network" unless --run-network is given, and caches live USDA and parser results
+
+import os
+import sys
+import pytest
+
+# Add the shared directory to the path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'shared'))
+
+# Live USDA search results are kept here between runs (entries expire after USDA_CACHE_TTL_SECONDS)
+USDA_TEST_CACHE_PATH = os.path.join(os.path.dirname(__file__), '.usda_cache.sqlite')
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-network",
+        action="store_true",
+        default=False,
+        help="run tests that call live services (local test server, Supabase, USDA API, Groq)",
+    )
+    parser.addoption(
+        "--refresh-usda-cache",
+        action="store_true",
+        default=False,
+        help="delete the cached USDA search results before running",
+    )
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "network: test calls a live service and is skipped without --run-network")
+
+    if config.getoption("--refresh-usda-cache"):
+        for suffix in ("", "-wal", "-shm"):
+            try:
+                os.remove(USDA_TEST_CACHE_PATH + suffix)
+            except FileNotFoundError:
+                pass
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-network"):
+        return
+
+    skip_network = pytest.mark.skip(reason="needs --run-network")
+    for item in items:
+        if "network" in item.keywords:
+            item.add_marker(skip_network)
+
+@pytest.fixture
+def usda_disk_cache(monkeypatch):
+    """Serve repeat USDA searches from the on-disk cache instead of the live API"""
+    import usda_client
+    monkeypatch.setattr(usda_client, "USDA_CACHE_PATH", USDA_TEST_CACHE_PATH)
+
+@pytest.fixture(scope="session")
+def process_food_text():
+    """Run each distinct text through the processing pipeline once per session, importing it on first use"""
+    from processing import process_food_text as process
+    results = {}
+
+    def process_cached(text):
+        if text not in results:
+            results[text] = process(text)
+        return results[text]
+
+    return process_cached
+
+@pytest.fixture(scope="session")
+def usda():
+    """One USDA client for the session, so its pooled connections and caches carry across tests"""
+    from usda_client import USDAClient
+    with USDAClient() as client:
+        yield client
@@ -11,12 +11,14 @@ import os
 # Add the shared directory to the path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'shared'))
 
-from processing import process_food_text
+# process_food_text is a session fixture (conftest.py), so repeated phrases are processed once
+# Every test here runs text through the live Groq parser and USDA lookups
+pytestmark = pytest.mark.network
 
 class TestPieceCounting:
     """Test piece-to-gram conversions and token limit fixes"""
     
-    def test_large_number_almonds(self):
+    def test_large_number_almonds(self, process_food_text):
         """Test that large numbers don't cause token truncation"""
         result = process_food_text("I ate 815 almonds")
         
@@ -33,35 +35,27 @@ class TestPieceCounting:
         assert item["macros"]["calories"] > 6000
         assert item["macros"]["source"] == "usda"
     
-    def test_two_almonds_and_rice(self):
-        """Test that multi-item complex response doesn't get truncated"""
-        result = process_food_text("I ate two almonds and 100 grams of rice")
+    @pytest.mark.parametrize("text, expected", [
+        # Almonds: 2 × 1.5g = 3g, exact count given; rice: 100g as specified
+        ("I ate two almonds and 100 grams of rice", {"almond": ("3g", False), "rice": ("100g", False)}),
+        # Eggs: 2 × 50g = 100g, standard conversion; chicken: 50g as specified
+        ("I ate two eggs and 50 grams of chicken", {"egg": ("100g", False), "chicken": ("50g", False)}),
+    ], ids=["two_almonds_and_rice", "mixed_pieces_and_weights"])
+    def test_pieces_and_weights(self, process_food_text, text, expected):
+        """Test that mixed counts and weights parse into one item each, without truncation"""
+        result = process_food_text(text)
         
         # Should have 2 items, not fallback to raw transcription
-        assert len(result["items"]) == 2
+        assert len(result["items"]) == len(expected)
         assert "error" not in result  # No parser error fallback
         
-        # Find almonds and rice items
-        almonds_item = None
-        rice_item = None
-        
-        for item in result["items"]:
-            if "almond" in item["food"]:
-                almonds_item = item
-            elif "rice" in item["food"]:
-                rice_item = item
-        
-        # Test almonds: 2 × 1.5g = 3g
-        assert almonds_item is not None
-        assert almonds_item["quantity"] == "3g"
-        assert almonds_item["estimated"] == False  # Exact count given
-        
-        # Test rice: 100g as specified
-        assert rice_item is not None
-        assert rice_item["quantity"] == "100g"
-        assert rice_item["estimated"] == False  # Exact weight given
+        for food, (quantity, estimated) in expected.items():
+            item = next((item for item in result["items"] if food in item["food"]), None)
+            assert item is not None, f"No {food} item in {result['items']}"
+            assert item["quantity"] == quantity
+            assert item["estimated"] == estimated
     
-    def test_single_banana(self):
+    def test_single_banana(self, process_food_text):
         """Test single piece conversion works correctly"""
         result = process_food_text("I ate one banana")
         
@@ -78,33 +72,7 @@ class TestPieceCounting:
         assert item["macros"]["calories"] < 200
         assert item["macros"]["source"] == "usda"
     
-    def test_mixed_pieces_and_weights(self):
-        """Test mixed exact counts and weights"""
-        result = process_food_text("I ate two eggs and 50 grams of chicken")
-        
-        assert len(result["items"]) == 2
-        
-        # Find eggs and chicken
-        eggs_item = None
-        chicken_item = None
-        
-        for item in result["items"]:
-            if "egg" in item["food"]:
-                eggs_item = item
-            elif "chicken" in item["food"]:
-                chicken_item = item
-        
-        # Test eggs: 2 × 50g = 100g
-        assert eggs_item is not None
-        assert eggs_item["quantity"] == "100g"
-        assert eggs_item["estimated"] == False  # Standard conversion
-        
-        # Test chicken: 50g as specified
-        assert chicken_item is not None
-        assert chicken_item["quantity"] == "50g"
-        assert chicken_item["estimated"] == False  # Exact weight given
-    
-    def test_various_nut_pieces(self):
+    def test_various_nut_pieces(self, process_food_text):
         """Test different nut piece conversions"""
         # Test almonds
         result = process_food_text("I ate five almonds")
@@ -121,7 +89,7 @@ class TestPieceCounting:
 class TestUSDAFoodSelection:
     """Test that USDA returns raw foods over processed ones"""
     
-    def test_banana_returns_raw_not_dehydrated(self):
+    def test_banana_returns_raw_not_dehydrated(self, process_food_text):
         """Test banana returns raw banana, not dehydrated"""
         result = process_food_text("I ate one banana")
         item = result["items"][0]
@@ -133,7 +101,7 @@ class TestUSDAFoodSelection:
         # Should be closer to raw banana calories
         assert calories_per_100g < 150, f"Got {calories_per_100g} cal/100g, expected <150 for raw banana"
     
-    def test_chicken_returns_raw_not_cooked(self):
+    def test_chicken_returns_raw_not_cooked(self, process_food_text):
         """Test chicken returns raw chicken when possible"""
         result = process_food_text("I ate 100 grams of chicken")
         item = result["items"][0]
@@ -147,7 +115,7 @@ class TestUSDAFoodSelection:
 class TestTokenLimitRegression:
     """Test that complex inputs don't hit token limits"""
     
-    def test_complex_multi_item_description(self):
+    def test_complex_multi_item_description(self, process_food_text):
         """Test complex descriptions don't get truncated"""
         complex_input = "I ate two eggs, three slices of bread, a handful of almonds, 100 grams of chicken breast, and a medium apple"
         
@@ -13,12 +13,13 @@ import os
 # Add the shared directory to the path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'shared'))
 
-from processing import process_food_text
+# Every test here runs text through the live Groq parser and USDA lookups
+pytestmark = pytest.mark.network
 
 class TestPortionParser:
     """Test enhanced portion parsing with smart estimation"""
     
-    def test_bowl_of_cereal_with_milk(self):
+    def test_bowl_of_cereal_with_milk(self, process_food_text):
         """Test parsing bowl of cereal with milk - should estimate both portions"""
         transcription = "I had a bowl of cereal with milk"
         
@@ -39,7 +40,7 @@ class TestPortionParser:
         assert milk_item["estimated"] == True
         assert milk_item["unit"] == "ml"
     
-    def test_exact_quantity_eggs(self):
+    def test_exact_quantity_eggs(self, process_food_text):
         """Test parsing exact quantities - should not be estimated"""
         transcription = "I ate 2 eggs for breakfast"
         
@@ -54,7 +55,7 @@ class TestPortionParser:
         assert eggs_item["estimated"] == False  # Exact count given
         assert eggs_item["unit"] == "g"
     
-    def test_handful_of_nuts(self):
+    def test_handful_of_nuts(self, process_food_text):
         """Test handful portion descriptor"""
         transcription = "I had a handful of almonds"
         
@@ -68,7 +69,7 @@ class TestPortionParser:
         assert almonds_item["estimated"] == True
         assert almonds_item["unit"] == "g"
     
-    def test_large_plate_of_pasta(self):
+    def test_large_plate_of_pasta(self, process_food_text):
         """Test size modifiers (large plate)"""
         transcription = "I ate a large plate of spaghetti"
         
@@ -84,7 +85,7 @@ class TestPortionParser:
         assert pasta_item["estimated"] == True
         assert pasta_item["unit"] == "g"
     
-    def test_glass_of_water(self):
+    def test_glass_of_water(self, process_food_text):
         """Test liquid in glass"""
         transcription = "I drank a glass of water"
         
@@ -98,7 +99,7 @@ class TestPortionParser:
         assert water_item["estimated"] == True
         assert water_item["unit"] == "ml"
     
-    def test_cup_of_cooked_rice(self):
+    def test_cup_of_cooked_rice(self, process_food_text):
         """Test cup measurement for solid food"""
         transcription = "I had a cup of rice"
         
@@ -112,7 +113,7 @@ class TestPortionParser:
         assert rice_item["estimated"] == False  # Cup is a standard measurement 
         assert rice_item["unit"] == "g"
     
-    def test_mixed_exact_and_estimated(self):
+    def test_mixed_exact_and_estimated(self, process_food_text):
         """Test mix of exact and estimated quantities"""
         transcription = "I ate 150 grams of chicken and a bowl of salad"
         
@@ -133,7 +134,7 @@ class TestPortionParser:
         assert salad_item["estimated"] == True
         assert salad_item["unit"] == "g"
 
-    def test_soup_bowl_liquid(self):
+    def test_soup_bowl_liquid(self, process_food_text):
         """Test soup in bowl - should be liquid measurement"""
         transcription = "I had a bowl of chicken soup"
         
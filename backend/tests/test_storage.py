@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+
+# ABOUTME: Tests for local JSONL log storage and its totals sidecar
+# ABOUTME: Runs against a temporary logs directory, covering store, update, delete, totals and the parse cache
+
+import pytest
+import sys
+import os
+import orjson
+
+# Add the shared directory to the path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'shared'))
+
+import storage
+
+def _item(food, quantity, calories, protein_g=0.0, carbs_g=0.0, fat_g=0.0):
+    """Build a processed food item with macros"""
+    return {
+        "food": food,
+        "quantity": quantity,
+        "macros": {"calories": calories, "protein_g": protein_g, "carbs_g": carbs_g, "fat_g": fat_g}
+    }
+
+@pytest.fixture
+def logs_dir(monkeypatch, tmp_path):
+    """Point storage at an empty logs directory with an empty parse cache"""
+    monkeypatch.setattr(storage, "LOGS_DIR", str(tmp_path))
+    with storage._PARSED_FILES_LOCK:
+        storage._PARSED_FILES.clear()
+    return tmp_path
+
+@pytest.fixture
+def today(logs_dir):
+    return storage._today()
+
+def _read_sidecar(date):
+    with open(storage._totals_path(date), 'rb') as file:
+        return orjson.loads(file.read())
+
+class TestStoreFoodData:
+    """Test appending entries and keeping the totals sidecar in step"""
+
+    def test_appends_one_line_per_entry(self, today):
+        """Test each store adds one JSONL line"""
+        storage.store_food_data([_item("rice", "100g", 130, 2.7, 28.0, 0.3)])
+        storage.store_food_data([_item("egg", "1 large", 72, 6.3, 0.4, 4.8)])
+
+        with open(storage._log_path(today), 'rb') as file:
+            lines = file.read().splitlines()
+        assert len(lines) == 2
+        assert orjson.loads(lines[1])["items"][0]["food"] == "egg"
+
+    def test_sidecar_adds_each_entry(self, today):
+        """Test the sidecar holds the running totals of every stored entry"""
+        storage.store_food_data([_item("rice", "100g", 130, 2.7, 28.0, 0.3)])
+        storage.store_food_data([_item("egg", "1 large", 72, 6.3, 0.4, 4.8)])
+
+        expected = {"calories": 202, "protein_g": 9.0, "carbs_g": 28.4, "fat_g": 5.1}
+        assert _read_sidecar(today) == expected
+        assert storage.get_daily_totals() == expected
+
+    def test_rejects_empty_items(self, logs_dir):
+        with pytest.raises(ValueError):
+            storage.store_food_data([])
+
+class TestReadTotals:
+    """Test reading totals when no sidecar exists"""
+
+    def test_empty_day(self, today, logs_dir):
+        """Test a day with nothing logged has zero totals and creates no files"""
+        assert storage.get_daily_totals() == {"calories": 0, "protein_g": 0, "carbs_g": 0, "fat_g": 0}
+        assert not os.path.exists(storage._totals_path(today))
+
+    def test_missing_sidecar_is_computed_without_writing(self, today):
+        """Test totals are computed from entries and the read leaves the sidecar missing"""
+        storage.store_food_data([_item("rice", "100g", 130, 2.7, 28.0, 0.3)])
+        os.remove(storage._totals_path(today))
+
+        assert storage.get_daily_totals()["calories"] == 130
+        assert not os.path.exists(storage._totals_path(today))
+
+class TestLegacyJsonLog:
+    """Test days that still have a whole-file JSON log"""
+
+    @pytest.fixture
+    def legacy_entry(self, today):
+        entry = {
+            "id": "legacy-1",
+            "timestamp": f"{today}T08:00:00",
+            "items": [_item("oats", "50g", 190, 6.5, 33.0, 3.5)]
+        }
+        with open(storage._json_log_path(today), 'wb') as file:
+            file.write(orjson.dumps({"entries": [entry], "daily_macros": {"calories": 190}}))
+        return entry
+
+    def test_entries_merge_json_then_jsonl(self, legacy_entry):
+        """Test JSON log entries come before JSONL entries"""
+        storage.store_food_data([_item("rice", "100g", 130, 2.7, 28.0, 0.3)])
+
+        entries = storage.get_today_entries()
+        assert [entry["items"][0]["food"] for entry in entries] == ["oats", "rice"]
+        assert storage.get_daily_totals()["calories"] == 320
+
+    def test_rewrite_moves_entries_into_jsonl(self, today, legacy_entry):
+        """Test a delete rewrites the remaining legacy entries as JSONL and drops the JSON log"""
+        storage.store_food_data([_item("rice", "100g", 130, 2.7, 28.0, 0.3)])
+        rice_id = storage.get_today_entries()[1]["id"]
+
+        assert storage.delete_entry(rice_id)
+        assert not os.path.exists(storage._json_log_path(today))
+        assert [entry["id"] for entry in storage.get_today_entries()] == ["legacy-1"]
+        assert _read_sidecar(today)["calories"] == 190
+
+class TestDeleteEntry:
+    """Test deleting entries from today's log"""
+
+    def test_delete_updates_totals(self, today):
+        storage.store_food_data([_item("rice", "100g", 130, 2.7, 28.0, 0.3)])
+        storage.store_food_data([_item("egg", "1 large", 72, 6.3, 0.4, 4.8)])
+        rice_id = storage.get_today_entries()[0]["id"]
+
+        assert storage.delete_entry(rice_id)
+        assert [entry["items"][0]["food"] for entry in storage.get_today_entries()] == ["egg"]
+        assert _read_sidecar(today) == {"calories": 72, "protein_g": 6.3, "carbs_g": 0.4, "fat_g": 4.8}
+
+    def test_unknown_id(self, today):
+        storage.store_food_data([_item("rice", "100g", 130)])
+        assert not storage.delete_entry("missing")
+        assert len(storage.get_today_entries()) == 1
+
+    def test_empty_day(self, logs_dir):
+        assert not storage.delete_entry("missing")
+
+class TestUpdateEntryQuantity:
+    """Test quantity updates that scale macros without reprocessing"""
+
+    def test_same_unit_scales_macros(self, today):
+        """Test '100g' -> '200g' doubles the macros and the totals"""
+        storage.store_food_data([_item("rice", "100g", 130, 2.7, 28.0, 0.3)])
+        entry_id = storage.get_today_entries()[0]["id"]
+
+        assert storage.update_entry_quantity(entry_id, "200g")
+        item = storage.get_today_entries()[0]["items"][0]
+        assert item["quantity"] == "200g"
+        assert item["macros"] == {"calories": 260, "protein_g": 5.4, "carbs_g": 56.0, "fat_g": 0.6}
+        assert _read_sidecar(today)["calories"] == 260
+
+    def test_plural_unit_scales_macros(self, today):
+        storage.store_food_data([_item("rice", "1 cup", 200)])
+        entry_id = storage.get_today_entries()[0]["id"]
+
+        assert storage.update_entry_quantity(entry_id, "2 cups")
+        assert storage.get_today_entries()[0]["items"][0]["macros"]["calories"] == 400
+
+    def test_unknown_id(self, today):
+        storage.store_food_data([_item("rice", "100g", 130)])
+        assert not storage.update_entry_quantity("missing", "200g")
+
+    def test_failed_write_leaves_reads_unchanged(self, today, monkeypatch):
+        """Test an update that fails to save is not served from the parse cache"""
+        storage.store_food_data([_item("rice", "100g", 130, 2.7, 28.0, 0.3)])
+        entry_id = storage.get_today_entries()[0]["id"]
+
+        def fail_write(filepath, data):
+            raise OSError("disk full")
+        monkeypatch.setattr(storage, "_atomic_write", fail_write)
+
+        with pytest.raises(OSError):
+            storage.update_entry_quantity(entry_id, "200g")
+        item = storage.get_today_entries()[0]["items"][0]
+        assert item["quantity"] == "100g"
+        assert item["macros"]["calories"] == 130
+
+class TestParsedFileCache:
+    """Test the (mtime_ns, size) parse cache"""
+
+    def test_unchanged_file_is_parsed_once(self, today):
+        storage.store_food_data([_item("rice", "100g", 130)])
+        path = storage._log_path(today)
+
+        first = storage._read_parsed(path, storage._parse_jsonl_log)
+        assert storage._read_parsed(path, storage._parse_jsonl_log) is first
+
+    def test_changed_file_is_reparsed(self, today):
+        storage.store_food_data([_item("rice", "100g", 130)])
+        path = storage._log_path(today)
+        first = storage._read_parsed(path, storage._parse_jsonl_log)
+
+        storage.store_food_data([_item("egg", "1 large", 72)])
+        assert len(storage._read_parsed(path, storage._parse_jsonl_log)) == 2
+        assert len(first) == 1
+
+    def test_uncached_read_is_private(self, today):
+        """Test use_cache=False returns a fresh parse and leaves nothing cached for the file"""
+        storage.store_food_data([_item("rice", "100g", 130)])
+        path = storage._log_path(today)
+        cached = storage._read_parsed(path, storage._parse_jsonl_log)
+
+        private = storage._read_parsed(path, storage._parse_jsonl_log, use_cache=False)
+        assert private is not cached
+        assert path not in storage._PARSED_FILES
+
+    def test_missing_file(self, logs_dir):
+        assert storage._read_parsed(str(logs_dir / "missing.jsonl"), storage._parse_jsonl_log) is None
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+
+# ABOUTME: Tests for audio transcription with the Groq SDK mocked out
+# ABOUTME: Covers format validation and the upload call without hitting api.groq.com
+
+import pytest
+import sys
+import os
+from unittest.mock import patch
+
+# Add the shared directory to the path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'shared'))
+
+import transcription
+from transcription import transcribe_file
+
+@pytest.fixture
+def mock_groq(monkeypatch):
+    """Replace the Groq client with a mock returning a canned transcription"""
+    monkeypatch.setattr(transcription, "_groq_client", None)
+    with patch("transcription.Groq") as groq:
+        groq.return_value.audio.transcriptions.create.return_value = " I ate chicken breast\n"
+        yield groq
+
+class TestTranscribeFile:
+    """Test transcribe_file without calling the Groq API"""
+
+    def test_returns_stripped_transcription(self, mock_groq, tmp_path):
+        """Test the canned transcription comes back without surrounding whitespace"""
+        audio_path = tmp_path / "meal.WAV"
+        audio_path.write_bytes(b"RIFF")
+
+        assert transcribe_file(str(audio_path)) == "I ate chicken breast"
+
+        create = mock_groq.return_value.audio.transcriptions.create
+        create.assert_called_once()
+        filename, file, content_type = create.call_args.kwargs["file"]
+        assert filename == "meal.WAV"
+        assert file.name == str(audio_path)  # Open handle, not the file's bytes
+        assert content_type == "audio/wav"
+
+    def test_reuses_client(self, mock_groq, tmp_path):
+        """Test one Groq client is created for repeated transcriptions"""
+        audio_path = tmp_path / "meal.webm"
+        audio_path.write_bytes(b"webm")
+
+        transcribe_file(str(audio_path))
+        transcribe_file(str(audio_path))
+
+        mock_groq.assert_called_once()
+
+    def test_rejects_unsupported_format(self, mock_groq, tmp_path):
+        """Test unsupported extensions raise before any API call"""
+        text_path = tmp_path / "meal.txt"
+        text_path.write_text("not audio")
+
+        with pytest.raises(ValueError, match="Audio format not supported"):
+            transcribe_file(str(text_path))
+        mock_groq.assert_not_called()
+
+    def test_missing_file(self, mock_groq):
+        """Test a missing file raises FileNotFoundError"""
+        with pytest.raises(FileNotFoundError):
+            transcribe_file("does_not_exist.wav")
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
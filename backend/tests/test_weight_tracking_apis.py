@@ -13,9 +13,37 @@ from datetime import datetime, timedelta
 BASE_URL = "http://localhost:5001"  # Local testing
 # BASE_URL = "https://voice-food-logger-backend.vercel.app"  # Production testing
 
+# Every test here calls the running test server, which talks to Supabase
+pytestmark = pytest.mark.network
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Fields each summary endpoint must return
+WEIGHT_SUMMARY_FIELDS = frozenset({
+    "current_weight", "goal_weight", "weight_change_month",
+    "weight_change_week", "progress_to_goal", "entries_count"
+})
+CALORIE_TODAY_FIELDS = frozenset({
+    "date", "current_calories", "goal_calories",
+    "remaining_calories", "progress_percentage", "is_over_goal"
+})
+CALORIE_SUMMARY_FIELDS = frozenset({
+    "period", "avg_calories", "goal_calories",
+    "days_under_goal", "days_over_goal", "total_days"
+})
+
+# One keep-alive connection pool for every request in this module
+SESSION = requests.Session()
+
+@pytest.fixture(scope="module", autouse=True)
+def close_session():
+    """Close the shared session's pooled connections after the module's tests"""
+    yield
+    SESSION.close()
+
 def test_user_goals_get():
     """Test GET /api/user-goals endpoint"""
-    response = requests.get(f"{BASE_URL}/api/user-goals")
+    response = SESSION.get(f"{BASE_URL}/api/user-goals")
     
     assert response.status_code == 200
     data = response.json()
@@ -39,10 +67,10 @@ def test_user_goals_update():
         "weight_goal_kg": 68.0
     }
     
-    response = requests.post(
+    response = SESSION.post(
         f"{BASE_URL}/api/user-goals",
         json=new_goals,
-        headers={"Content-Type": "application/json"}
+        headers=JSON_HEADERS
     )
     
     assert response.status_code == 200
@@ -55,10 +83,10 @@ def test_user_goals_update():
     
     # Test validation - invalid calorie goal
     invalid_goals = {"calorie_goal": 100}  # Too low
-    response = requests.post(
+    response = SESSION.post(
         f"{BASE_URL}/api/user-goals",
         json=invalid_goals,
-        headers={"Content-Type": "application/json"}
+        headers=JSON_HEADERS
     )
     
     assert response.status_code == 400
@@ -70,10 +98,10 @@ def test_weight_entries_post():
         "weight_kg": 72.3
     }
     
-    response = requests.post(
+    response = SESSION.post(
         f"{BASE_URL}/api/weight-entries",
         json=weight_data,
-        headers={"Content-Type": "application/json"}
+        headers=JSON_HEADERS
     )
     
     assert response.status_code == 200
@@ -84,10 +112,10 @@ def test_weight_entries_post():
     
     # Test validation - invalid weight
     invalid_weight = {"weight_kg": 500}  # Too high
-    response = requests.post(
+    response = SESSION.post(
         f"{BASE_URL}/api/weight-entries",
         json=invalid_weight,
-        headers={"Content-Type": "application/json"}
+        headers=JSON_HEADERS
     )
     
     assert response.status_code == 400
@@ -95,7 +123,7 @@ def test_weight_entries_post():
 
 def test_weight_entries_get():
     """Test GET /api/weight-entries endpoint"""
-    response = requests.get(f"{BASE_URL}/api/weight-entries")
+    response = SESSION.get(f"{BASE_URL}/api/weight-entries")
     
     assert response.status_code == 200
     data = response.json()
@@ -107,7 +135,7 @@ def test_weight_entries_get():
     
     # Test date filtering
     today = datetime.now().date().isoformat()
-    response = requests.get(f"{BASE_URL}/api/weight-entries?start_date={today}&end_date={today}")
+    response = SESSION.get(f"{BASE_URL}/api/weight-entries?start_date={today}&end_date={today}")
     
     assert response.status_code == 200
 
@@ -116,7 +144,7 @@ def test_weight_history_periods():
     periods = ["today", "week", "month"]
     
     for period in periods:
-        response = requests.get(f"{BASE_URL}/api/weight-history?period={period}")
+        response = SESSION.get(f"{BASE_URL}/api/weight-history?period={period}")
         
         assert response.status_code == 200
         data = response.json()
@@ -134,7 +162,7 @@ def test_weight_history_periods():
 
 def test_weight_history_latest():
     """Test GET /api/weight-history/latest endpoint"""
-    response = requests.get(f"{BASE_URL}/api/weight-history/latest")
+    response = SESSION.get(f"{BASE_URL}/api/weight-history/latest")
     
     assert response.status_code == 200
     data = response.json()
@@ -146,7 +174,7 @@ def test_weight_history_latest():
 
 def test_weight_history_summary():
     """Test GET /api/weight-history/summary endpoint"""
-    response = requests.get(f"{BASE_URL}/api/weight-history/summary")
+    response = SESSION.get(f"{BASE_URL}/api/weight-history/summary")
     
     assert response.status_code == 200
     data = response.json()
@@ -154,21 +182,15 @@ def test_weight_history_summary():
     assert data["success"] == True
     assert "data" in data
     
-    summary = data["data"]
-    expected_fields = [
-        "current_weight", "goal_weight", "weight_change_month",
-        "weight_change_week", "progress_to_goal", "entries_count"
-    ]
-    
-    for field in expected_fields:
-        assert field in summary
+    missing = WEIGHT_SUMMARY_FIELDS - data["data"].keys()
+    assert not missing, f"Missing fields: {missing}"
 
 def test_calorie_history_periods():
     """Test GET /api/calorie-history with different periods"""
     periods = ["today", "week", "month"]
     
     for period in periods:
-        response = requests.get(f"{BASE_URL}/api/calorie-history?period={period}")
+        response = SESSION.get(f"{BASE_URL}/api/calorie-history?period={period}")
         
         assert response.status_code == 200
         data = response.json()
@@ -186,7 +208,7 @@ def test_calorie_history_periods():
 
 def test_calorie_history_today():
     """Test GET /api/calorie-history/today endpoint"""
-    response = requests.get(f"{BASE_URL}/api/calorie-history/today")
+    response = SESSION.get(f"{BASE_URL}/api/calorie-history/today")
     
     assert response.status_code == 200
     data = response.json()
@@ -194,51 +216,38 @@ def test_calorie_history_today():
     assert data["success"] == True
     assert "data" in data
     
-    progress = data["data"]
-    expected_fields = [
-        "date", "current_calories", "goal_calories",
-        "remaining_calories", "progress_percentage", "is_over_goal"
-    ]
-    
-    for field in expected_fields:
-        assert field in progress
+    missing = CALORIE_TODAY_FIELDS - data["data"].keys()
+    assert not missing, f"Missing fields: {missing}"
 
 def test_calorie_history_summary():
     """Test GET /api/calorie-history/summary endpoint"""
     periods = ["week", "month"]
     
     for period in periods:
-        response = requests.get(f"{BASE_URL}/api/calorie-history/summary?period={period}")
+        response = SESSION.get(f"{BASE_URL}/api/calorie-history/summary?period={period}")
         
         assert response.status_code == 200
         data = response.json()
         
         assert data["success"] == True
-        summary = data["data"]
-        
-        expected_fields = [
-            "period", "avg_calories", "goal_calories",
-            "days_under_goal", "days_over_goal", "total_days"
-        ]
-        
-        for field in expected_fields:
-            assert field in summary
+        missing = CALORIE_SUMMARY_FIELDS - data["data"].keys()
+        assert not missing, f"Missing fields for {period}: {missing}"
 
 def test_error_handling():
     """Test error handling for invalid requests"""
     # Invalid period
-    response = requests.get(f"{BASE_URL}/api/weight-history?period=invalid")
+    response = SESSION.get(f"{BASE_URL}/api/weight-history?period=invalid")
     assert response.status_code == 400
     
     # Missing request body
-    response = requests.post(f"{BASE_URL}/api/weight-entries")
+    response = SESSION.post(f"{BASE_URL}/api/weight-entries")
     assert response.status_code == 400
     
     # Invalid JSON
-    response = requests.post(
+    response = SESSION.post(
         f"{BASE_URL}/api/user-goals",
         data="invalid json",
-        headers={"Content-Type": "application/json"}
+        headers=JSON_HEADERS
     )
     assert response.status_code == 400
 
@@ -246,15 +255,15 @@ def test_weight_entry_crud():
     """Test complete CRUD cycle for weight entries"""
     # Create
     weight_data = {"weight_kg": 71.5}
-    response = requests.post(
+    response = SESSION.post(
         f"{BASE_URL}/api/weight-entries",
         json=weight_data,
-        headers={"Content-Type": "application/json"}
+        headers=JSON_HEADERS
     )
     assert response.status_code == 200
     
     # Read - verify it exists
-    response = requests.get(f"{BASE_URL}/api/weight-entries")
+    response = SESSION.get(f"{BASE_URL}/api/weight-entries")
     assert response.status_code == 200
     entries = response.json()["data"]
     
@@ -269,7 +278,7 @@ def test_weight_entry_crud():
     entry_id = test_entry["id"]
     
     # Delete
-    response = requests.delete(f"{BASE_URL}/api/weight-entries/{entry_id}")
+    response = SESSION.delete(f"{BASE_URL}/api/weight-entries/{entry_id}")
     assert response.status_code == 200
 
 if __name__ == "__main__":
@@ -278,7 +287,7 @@ if __name__ == "__main__":
     
     try:
         # Test basic connectivity
-        response = requests.get(f"{BASE_URL}/api/health", timeout=5)
+        response = SESSION.get(f"{BASE_URL}/api/health", timeout=5)
         print(f"✅ Server accessible at {BASE_URL}")
         
         # Run key tests manually